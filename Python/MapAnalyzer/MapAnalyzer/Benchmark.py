@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import networkx as nx
+import MapAnalysis as ma
+import MapGenerator as mg
+from MapAnalysis.Instrumentation import instrumentation
+
+### PARAMETERS ###############################################################
+
+# Population strategies with their arguments and the phases they depend on.
+STRATEGIES = [
+    ("safe", ma.addSpawnPointsSafe, (["s", 5],), ["diameter", "visibility"]),
+    ("unsafe", ma.addSpawnPointsUnsafe, (["s", 5],), ["diameter", "visibility"]),
+    ("uniform", ma.addSpawnPointsUniformly, (["s", 5],), ["visibility"]),
+    ("random", ma.addSpawnPointsRandom, (["s", 5],), []),
+    ("everything", ma.addEverything, (["s", 5], ["h", 4], ["a", 4]), ["diameter", "visibility"]),
+]
+
+# Maps used when none is specified.
+DEFAULT_MAPS = ["arena", "corridors", "intense", "a", "b", "c"]
+
+# Maximum number of tiles of the maps whose approximated visibility is compared
+# with the exact one.
+EXACT_VISIBILITY_MAX_TILES = 10000
+
+### BENCHMARK FUNCTIONS #######################################################
+
+# Runs a function and returns its result, the elapsed wall time and the peak
+# memory allocated while it was running. Tracing the memory slows down the 
+# function considerably, so it is run a second time to get the peak memory.
+def measure(function, *args, memory = False):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        # The counters of the analyzer are kept as they were after the first run.
+        counters = dict(instrumentation.counters)
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        instrumentation.counters = counters
+    return result, elapsed, peak
+
+# Returns the path of the AB file of a map, whose extension may be lowercase.
+def getABFilePath(inputDir, mapName):
+    ABFilePath = inputDir + "/" + mapName + ".AB.txt"
+    if not os.path.isfile(ABFilePath):
+        ABFilePath = inputDir + "/" + mapName + ".ab.txt"
+    return ABFilePath
+
+# Reads and refines a map.
+def readFiles(mapFilePath, ABFilePath):
+    map = ma.readMap(mapFilePath)
+    rooms = ma.readAB(ABFilePath)
+    ma.mergeRooms(rooms)
+    rooms = ma.removeRooms(rooms)
+    return map, rooms
+
+# Scales a map and its rooms up by an integer factor, each tile becomes a
+# block of tiles and each object is kept only in the first tile of its block.
+def scaleMap(map, rooms, factor):
+    scaledMap = [[(map[x // factor][y // factor] if (x % factor == 0 and y % factor == 0) or
+                   map[x // factor][y // factor] == "w" else "r")
+                  for y in range(len(map[0]) * factor)] for x in range(len(map) * factor)]
+    scaledRooms = []
+
+    for room in rooms:
+        scaledRoom = ma.Room()
+        scaledRoom.originX = room.originX * factor
+        scaledRoom.originY = room.originY * factor
+        scaledRoom.endX = (room.endX + 1) * factor - 1
+        scaledRoom.endY = (room.endY + 1) * factor - 1
+        scaledRoom.isCorridor = room.isCorridor
+        scaledRoom.level = room.level
+        scaledRooms.append(scaledRoom)
+
+    return scaledMap, scaledRooms
+
+# Generates a synthetic square map and reads it back as the analyzer does.
+def generateSyntheticMap(size):
+    random.seed(size)
+    levels, genomes = mg.generateMap(size, size)
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        mg.exportMap(levels, tempDir + "/synthetic.map.txt")
+        mg.exportAB(genomes, tempDir + "/synthetic.AB.txt")
+        return readFiles(tempDir + "/synthetic.map.txt", tempDir + "/synthetic.AB.txt")
+
+# Computes the metrics of a session ignoring the memoized ones.
+def getColdMetrics(session):
+    ma.roomGraphMetricsCache.clear()
+    session.metrics = None
+    return session.getMetrics()
+
+# Computes the visibility matrix of a session ignoring the cached one.
+def getColdVisibilityMatrix(session):
+    session.visibilityMatrix = None
+    return session.getVisibilityMatrix()
+
+# Wraps a strategy so that each run uses the same random sequence.
+def seeded(function):
+    def run(*args):
+        random.seed(0)
+        return function(*args)
+    return run
+
+# Benchmarks all the strategies on a map. The counters of the analyzer are
+# reported with the timings. If a visibility error is specified the visibility
+# is approximated and, on small maps, compared with the exact one.
+def benchmarkMap(name, map, rooms, strategies, memory, visibilityError = None):
+    result = {"map": name, "width": len(map), "height": len(map[0]), "rooms": len(rooms),
+              "phases": {}, "strategies": {}}
+    instrumentation.reset()
+
+    session, elapsed, peak = measure(ma.PlacementSession, map, rooms, visibilityError, memory = memory)
+    result["phases"]["graph"] = {"time": elapsed, "peakMemory": peak}
+    _, elapsed, peak = measure(getColdMetrics, session, memory = memory)
+    result["phases"]["diameter"] = {"time": elapsed, "peakMemory": peak}
+    _, elapsed, peak = measure(getColdVisibilityMatrix, session, memory = memory)
+    result["phases"]["visibility"] = {"time": elapsed, "peakMemory": peak}
+
+    for strategyName, function, args, phases in strategies:
+        _, elapsed, peak = measure(seeded(function), session, *args, memory = memory)
+        # The total includes the shared phases the strategy depends on.
+        total = elapsed + sum([result["phases"][phase]["time"] for phase in ["graph"] + phases])
+        result["strategies"][strategyName] = {"placement": {"time": elapsed, "peakMemory": peak},
+                                              "phases": ["graph"] + phases, "total": total}
+
+    result["counters"] = instrumentation.counters
+
+    if visibilityError is not None and len(map) * len(map[0]) <= EXACT_VISIBILITY_MAX_TILES:
+        meanError, maxError = ma.getVisibilityError(session.map, visibilityError)
+        result["visibilityError"] = {"bound": visibilityError, "mean": meanError, "max": maxError}
+
+    return result
+
+# Prints the results as a table.
+def printResults(results):
+    print("%-16s %-10s %10s %10s %10s %10s %10s" % ("MAP", "STRATEGY", "GRAPH", "DIAMETER",
+                                                   "VISIBILITY", "PLACEMENT", "TOTAL"))
+    for result in results:
+        for strategyName, strategy in result["strategies"].items():
+            print("%-16s %-10s %10.3f %10.3f %10.3f %10.3f %10.3f" % (result["map"], strategyName,
+                  result["phases"]["graph"]["time"], result["phases"]["diameter"]["time"],
+                  result["phases"]["visibility"]["time"], strategy["placement"]["time"],
+                  strategy["total"]))
+
+    for result in results:
+        if "visibilityError" in result:
+            print("%s: visibility error mean %.4f, max %.4f (bound %.4f)" % 
+                  (result["map"], result["visibilityError"]["mean"], result["visibilityError"]["max"],
+                   result["visibilityError"]["bound"]))
+
+### MAIN ######################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmarks the population strategies.")
+    parser.add_argument("maps", nargs = "*", default = DEFAULT_MAPS,
+                        help = "names of the maps in the input folder")
+    parser.add_argument("--input", default = "./Input", help = "input folder")
+    parser.add_argument("--output", default = "./Output/benchmark.json", help = "JSON output file")
+    parser.add_argument("--strategies", nargs = "+", default = [s[0] for s in STRATEGIES],
+                        choices = [s[0] for s in STRATEGIES], help = "strategies to benchmark")
+    parser.add_argument("--scales", nargs = "*", type = int, default = [2],
+                        help = "factors of the scaled-up versions of each map")
+    parser.add_argument("--synthetic", nargs = "*", type = int, default = [],
+                        help = "sizes of the synthetic square maps to generate")
+    parser.add_argument("--memory", action = "store_true",
+                        help = "also measure the peak memory, running each phase a second time")
+    parser.add_argument("--visibility-error", type = float, default = None,
+                        help = "approximate the visibility within this error of the normalized visibility")
+    parser.add_argument("--profile", default = None,
+                        help = "file where the cProfile statistics of the whole run are dumped")
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        instrumentation.startProfiling()
+
+    strategies = [s for s in STRATEGIES if s[0] in args.strategies]
+    results = []
+
+    for mapName in args.maps:
+        map, rooms = readFiles(args.input + "/" + mapName + ".map.txt",
+                               getABFilePath(args.input, mapName))
+
+        if ma.isMultilevel(rooms):
+            print("[WARNING] Skipping " + mapName + ", population not supported for multi-level maps.",
+                  file = sys.stderr)
+            continue
+
+        results.append(benchmarkMap(mapName, map, rooms, strategies, args.memory, args.visibility_error))
+
+        for factor in args.scales:
+            scaledMap, scaledRooms = scaleMap(map, rooms, factor)
+            results.append(benchmarkMap(mapName + "_x" + str(factor), scaledMap, scaledRooms,
+                                        strategies, args.memory, args.visibility_error))
+
+    for size in args.synthetic:
+        map, rooms = generateSyntheticMap(size)
+        results.append(benchmarkMap("synthetic_" + str(size), map, rooms, strategies, args.memory,
+                                    args.visibility_error))
+
+    if args.profile is not None:
+        instrumentation.stopProfiling(args.profile)
+
+    printResults(results)
+
+    outputDir = os.path.dirname(args.output)
+    if outputDir != "" and not os.path.exists(outputDir):
+        os.makedirs(outputDir)
+
+    with open(args.output, "w") as f:
+        json.dump({"date": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                   "networkx": nx.__version__, "memoryTraced": args.memory,
+                   "visibilityError": args.visibility_error,
+                   "results": results}, f, indent = 2)
@@ -0,0 +1,386 @@
+import math
+import numpy as np
+import networkx as nx
+from MapAnalysis.Instrumentation import logger, instrumentation
+from MapAnalysis.Support import getRoomsContainingCoord, canJumpFromTo, makeBidirectional, isMultilevel, \
+    subToInd, eulerianDistance
+from MapAnalysis.Visibility import getTilePairs, areTilesVisible
+
+### GRAPH FUNCTIONS ##########################################################
+
+# Computes the tile graph.
+def getTileGraph(map, verbose = True):
+    if verbose:
+        logger.info("Generating the graph...")
+
+    if (len(map) > 0):
+        G = nx.DiGraph()
+    else:
+        G = nx.Graph()
+
+    if (len(map) > 0):
+        for i in range (len(map)):
+            getTileLevelNodes(map[i], i, G)
+        makeBidirectional(G)
+        addStairsEdgesTiles(G, map)
+        addJumpEdgesTiles(G, map)
+    else:
+        getTileLevelNodes(map, G)
+
+    instrumentation.count("nodesAdded", G.number_of_nodes())
+    instrumentation.count("edgesAdded", G.number_of_edges())
+
+    if verbose:
+        logger.info("Done.")
+        logger.info("The tiles graph has:")
+        logger.info("%i nodes." % (nx.number_of_nodes(G)))
+        logger.info("%i edges." % (nx.number_of_edges(G)))
+    return G
+
+# Computes the rooms and corridors graph. The map is needed to connect the 
+# stairs of multi-level maps.
+def getRoomsCorridorsGraph(rooms, verbose=True, map=None):
+    if isMultilevel(rooms) and map is None:
+        raise ValueError("The map is needed to connect the stairs of a multi-level map.")
+
+    if verbose:
+        logger.info("Generating the graph...")
+
+    if (isMultilevel(rooms)):
+        G = nx.DiGraph()
+    else:
+        G = nx.Graph()
+
+    for i in range(len(rooms)):
+        G.add_node("r" + str(i), originX = rooms[i].originX, originY = rooms[i].originY, endX = rooms[i].endX, 
+                   endY = rooms[i].endY, isCorridor = rooms[i].isCorridor, level = rooms[i].level)
+    
+    for i in range(len(rooms)):
+        for j in range(i, len(rooms)):
+            if (j != i and rooms[i].level == rooms[j].level and not (rooms[i].originX >= rooms[j].endX + 1 or \
+                rooms[j].originX >= rooms[i].endX + 1) and not (rooms[i].originY >= rooms[j].endY + 1 or \
+                rooms[j].originY >= rooms[i].endY + 1)):
+                G.add_edge("r" + str(i), "r" + str(j), 
+                           weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                     (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                     (rooms[j].originX / 2 + rooms[j].endX / 2),
+                                                     (rooms[j].originY / 2 + rooms[j].endY / 2)))
+
+    if (isMultilevel(rooms)):
+        makeBidirectional(G)
+        addJumpEdgesRooms(rooms, G)
+        addStairsEdgesRooms(rooms, map, G)
+
+    instrumentation.count("nodesAdded", G.number_of_nodes())
+    instrumentation.count("edgesAdded", G.number_of_edges())
+
+    if verbose:
+        logger.info("Done.")
+        logger.info("The rooms and corridor graph has:")
+        logger.info("%i nodes." % (nx.number_of_nodes(G)))
+        logger.info("%i edges." % (nx.number_of_edges(G)))
+    return G
+
+# Computes the rooms, corridors and objects graph.
+def getRoomsCorridorsObjectsGraph(rooms, map, verbose=True):
+    if verbose:
+        logger.info("Generating the graph...")
+
+    G = getRoomsCorridorsGraph(rooms, False, map)
+    nodes = G.number_of_nodes()
+    edges = G.number_of_edges()
+
+    if (isMultilevel(rooms)):
+        width = len(map[0])
+        height = len(map[0][0])
+
+        for i in range(len(map)):
+            for x in range(width): 
+                for y in range(height): 
+                    # I exclude decorations ("d") and stairs (uppercase chars) from the game elements.
+                    if (not map[i][x][y] == "w" and not map[i][x][y] == "r" and not map[i][x][y] == "d"
+                        and not map[i][x][y].isupper()):
+                        G.add_node(subToInd(width, height, i, x, y), x = x, y = y, 
+                                   resource = map[i][x][y], level = i)
+                        for node in G.nodes(data=True):
+                            if (node[1]["level"] == i and "originX" in node[1] and 
+                                x >= node[1]["originX"] and x <= node[1]["endX"] and 
+                                y >= node[1]["originY"] and y <= node[1]["endY"]):
+                                weight = eulerianDistance(node[1]["originX"] / 2 + node[1]["endX"] / 2, 
+                                                          node[1]["originY"] / 2 + node[1]["endY"] / 2,
+                                                          x, y)
+                                G.add_edge(node[0], subToInd(width, height, i, x, y), weight = weight)
+                                G.add_edge(subToInd(width, height, i, x, y), node[0], weight = weight)
+    else:
+        width = len(map)
+        height = len(map[0])
+
+        for x in range(width): 
+            for y in range(height):
+                # I exclude decorations ("d") and stairs (uppercase chars) from the game elements.
+                if (not map[x][y] == "w" and not map[x][y] == "r" and not map[x][y] == "d" 
+                    and not map[x][y].isupper()):
+                    G.add_node(subToInd(width, height, 0, x, y), x = x, y = y, resource = map[x][y], 
+                               level = 0)
+                    for node in G.nodes(data=True):
+                        if ("originX" in node[1] and x >= node[1]["originX"] and x <= node[1]["endX"] and 
+                            y >= node[1]["originY"] and y <= node[1]["endY"]):
+                            G.add_edge(node[0], subToInd(width, height, 0, x, y), weight = 
+                                       eulerianDistance(node[1]["originX"] / 2 + node[1]["endX"] / 2, 
+                                                        node[1]["originY"] / 2 + node[1]["endY"] / 2,
+                                                        x, y))
+
+    instrumentation.count("nodesAdded", G.number_of_nodes() - nodes)
+    instrumentation.count("edgesAdded", G.number_of_edges() - edges)
+
+    if verbose:
+        logger.info("Done.")
+        logger.info("The rooms, corridors and objects graph has:")
+        logger.info("%i nodes." % (nx.number_of_nodes(G)))
+        logger.info("%i edges." % (nx.number_of_edges(G)))
+    return G
+
+# Computes the visibility graph.
+def getVisibilityGraph(map, verbose=True):
+    if verbose:
+        logger.info("Generating the graph...")
+
+    G = nx.Graph()
+    width = len(map)
+    height = len(map[0])
+
+    # Add the nodes.
+    for x in range(width): 
+        for y in range(height): 
+            if not map[x][y] == "w":
+                G.add_node(subToInd(width, height, 0, x, y), x = x, y = y, char = map[x][y], 
+                           visibility = 0)
+     
+    # Add the edges, checking each pair of nodes once.
+    walls = np.array(map) == "w"
+    nodes = list(G.nodes)
+    tiles = np.array([(data['x'], data['y']) for node, data in G.nodes(data = True)], dtype = int)
+    for first, second in getTilePairs(len(nodes)):
+        visible = areTilesVisible(walls, tiles[first, 0], tiles[first, 1], tiles[second, 0], tiles[second, 1])
+        G.add_edges_from([(nodes[i], nodes[j]) for i, j in zip(first[visible], second[visible])])
+        instrumentation.count("raysCast", len(first))
+
+    for node in G.nodes(data = True):
+        node[1]['visibility'] = G.degree(node[0])
+
+    instrumentation.count("nodesAdded", G.number_of_nodes())
+    instrumentation.count("edgesAdded", G.number_of_edges())
+
+    if verbose:
+        logger.info("Done.")
+        logger.info("The tiles graph has:")
+        logger.info("%i nodes." % (nx.number_of_nodes(G)))
+        logger.info("%i edges." % (nx.number_of_edges(G)))
+    return G
+
+# Computes the room outlines graph.
+def getRoomsOutlineGraph(rooms):
+    logger.info("Generating the graph...")
+
+    G = nx.Graph()
+    
+    i = 0
+
+    for room in rooms:
+        G.add_node(i, x = room.originX, y = room.originY, level = room.level)
+        i = i + 1
+        G.add_node(i, x = room.endX, y = room.originY, level = room.level)
+        G.add_edge(i, i - 1)
+        i = i + 1
+        G.add_node(i, x = room.endX, y = room.endY, level = room.level)
+        G.add_edge(i, i - 1)
+        i = i + 1
+        G.add_node(i, x = room.originX, y = room.endY, level = room.level)
+        G.add_edge(i, i - 1)
+        G.add_edge(i, i - 3)
+        i = i + 1
+
+    instrumentation.count("nodesAdded", G.number_of_nodes())
+    instrumentation.count("edgesAdded", G.number_of_edges())
+        
+    logger.info("Done.")
+    logger.info("The tiles graph has:")
+    logger.info("%i nodes." % (nx.number_of_nodes(G)))
+    logger.info("%i edges." % (nx.number_of_edges(G)))
+    return G
+
+# Returns the maximum and the minimum visibility.
+def minMaxVisibility(G):
+    min = math.inf
+    max = 0
+
+    for node in G.nodes(data = True):
+        if node[1]["visibility"] > max:
+            max = node[1]["visibility"]
+        elif node[1]["visibility"] < min:
+            min = node[1]["visibility"] 
+
+    return min, max
+
+### GRAPH SUPPORT FUNCTIONS ##################################################
+
+# Gets the tile graph for a single level.
+def getTileLevelNodes(map, level, graph):
+    width = len(map)
+    height = len(map[0])
+
+    # Add the nodes.
+    for x in range(width): 
+        for y in range(height): 
+            if not map[x][y] == "w":
+                graph.add_node(subToInd(width, height, level, x, y), x = x, y = y, char = map[x][y], 
+                               level = level)
+
+    # Add the edges.
+    for x in range(width): 
+        for y in range(height): 
+            if subToInd(width, height, level, x, y) in graph:
+                if subToInd(width, height, level, x + 1, y) in graph:
+                    graph.add_edge(subToInd(width, height, level, x + 1, y), 
+                                   subToInd(width, height, level, x, y))
+                if subToInd(width, height, level, x + 1, y + 1) in graph:
+                    graph.add_edge(subToInd(width, height, level, x + 1, y + 1), 
+                                   subToInd(width, height, level, x, y))                  
+                if subToInd(width, height, level, x, y + 1) in graph:
+                    graph.add_edge(subToInd(width, height, level, x, y + 1), 
+                                   subToInd(width, height, level, x, y))
+                if subToInd(width, height, level, x - 1, y + 1) in graph:
+                    graph.add_edge(subToInd(width, height, level, x - 1, y + 1), 
+                                   subToInd(width, height, level, x, y))
+
+# Adds edges where there are stairs.
+def addStairsEdgesTiles(G, map):
+    width = len(map[0])
+    height = len(map[0][0])
+
+    for i in range(len(map)):
+        for x in range(width): 
+            for y in range(height):
+                if (map[i][x][y].isupper()):
+                    if (map[i][x][y] == "W"):
+                        j = 1
+                        while(y + j < height and map[i][x][y + j] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        G.add_edge(subToInd(width, height, i, x, y), 
+                                   subToInd(width, height, i - 1, x, y + j), weigth = j)
+                        G.add_edge(subToInd(width, height, i - 1, x, y + j), 
+                                   subToInd(width, height, i, x, y), weigth = j)
+                    elif (map[i][x][y] == "D"):
+                        j = 1
+                        while(x + j < width and map[i][x + j][y] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        G.add_edge(subToInd(width, height, i, x, y), 
+                                   subToInd(width, height, i - 1, x + j, y), weigth = j)
+                        G.add_edge(subToInd(width, height, i - 1, x + j, y), 
+                                   subToInd(width, height, i, x, y), weigth = j)
+                    elif (map[i][x][y] == "S"):
+                        j = 1
+                        while(y - j >= 0 and map[i][x][y - j] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        G.add_edge(subToInd(width, height, i, x, y), 
+                                   subToInd(width, height, i - 1, x, y - j), weigth = j)
+                        G.add_edge(subToInd(width, height, i - 1, x, y - j), 
+                                   subToInd(width, height, i, x, y), weigth = j)
+                    elif (map[i][x][y] == "A"):
+                        j = 1
+                        while(x - j >= 0 and map[i][x - j][y] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        G.add_edge(subToInd(width, height, i, x, y), 
+                                   subToInd(width, height, i - 1, x - j, y), weigth = j)
+                        G.add_edge(subToInd(width, height, i - 1, x - j, y), 
+                                   subToInd(width, height, i, x, y), weigth = j)
+
+# Adds edges where there are jumps.
+def addJumpEdgesTiles(G, map):
+    width = len(map[0])
+    height = len(map[0][0])
+
+    for i in range(1, len(map)):
+        for x in range(width): 
+            for y in range(height):
+                if (map[i][x][y] != "w" and map[i][x][y].islower()):
+                    for m in range (-1, 2):
+                        for n in range (-1, 2):
+                            if(map[i - 1][x + m][y + n] != "w" and map[i - 1][x + m][y + n].islower()):
+                                G.add_edge(subToInd(width, height, i, x, y), 
+                                   subToInd(width, height, i - 1, x + m, y + n))
+
+# Adds edges where there are jumps.
+def addJumpEdgesRooms(rooms, G):
+    for i in range(len(rooms)):
+        for j in range(len(rooms)):
+            if (i != j and rooms[i].level == rooms[j].level + 1):
+               if (canJumpFromTo(rooms[i], rooms[j])):
+                    G.add_edge("r" + str(i), "r" + str(j), 
+                               weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                         (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                         (rooms[j].originX / 2 + rooms[j].endX / 2),
+                                                         (rooms[j].originY / 2 + rooms[j].endY / 2)))
+
+# Adds edges where there are stairs.
+def addStairsEdgesRooms(rooms, map, G):
+    width = len(map[0])
+    height = len(map[0][0])
+
+    for i in range(len(rooms)):
+        for x in range(rooms[i].originX, rooms[i].endX + 1): 
+            for y in range(rooms[i].originY, rooms[i].endY + 1):
+                if (map[rooms[i].level][x][y].isupper()):
+                    level = rooms[i].level
+                    if (map[level][x][y] == "W"):
+                        j = 1
+                        while(y + j < height and map[level][x][y + j] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        for r in getRoomsContainingCoord(x, y + j, level - 1, rooms):
+                            weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                      (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                      (rooms[r].originX / 2 + rooms[r].endX / 2),
+                                                      (rooms[r].originY / 2 + rooms[r].endY / 2))
+                            G.add_edge("r" + str(i), "r" + str(r), weight = weight)
+                            G.add_edge("r" + str(r), "r" + str(i), weight = weight)           
+                    elif (map[level][x][y] == "D"):
+                        j = 1
+                        while(x + j < width and map[level][x + j][y] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        for r in getRoomsContainingCoord(x + j, y, level - 1, rooms):
+                            weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                      (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                      (rooms[r].originX / 2 + rooms[r].endX / 2),
+                                                      (rooms[r].originY / 2 + rooms[r].endY / 2))
+                            G.add_edge("r" + str(i), "r" + str(r), weight = weight)
+                            G.add_edge("r" + str(r), "r" + str(i), weight = weight)  
+                    elif (map[level][x][y] == "S"):
+                        j = 1
+                        while(y - j >= 0 and map[level][x][y - j] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        for r in getRoomsContainingCoord(x, y - j, level - 1, rooms):
+                            weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                      (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                      (rooms[r].originX / 2 + rooms[r].endX / 2),
+                                                      (rooms[r].originY / 2 + rooms[r].endY / 2))
+                            G.add_edge("r" + str(i), "r" + str(r), weight = weight)
+                            G.add_edge("r" + str(r), "r" + str(i), weight = weight)  
+                    elif (map[level][x][y] == "A"):
+                        j = 1
+                        while(x - j >= 0 and map[level][x - j][y] == "O"):
+                            j = j + 1
+                        j = j - 1
+                        for r in getRoomsContainingCoord(x - j, y, level - 1, rooms):
+                            weight = eulerianDistance((rooms[i].originX / 2 + rooms[i].endX / 2), 
+                                                      (rooms[i].originY / 2 + rooms[i].endY / 2), 
+                                                      (rooms[r].originX / 2 + rooms[r].endX / 2),
+                                                      (rooms[r].originY / 2 + rooms[r].endY / 2))
+                            G.add_edge("r" + str(i), "r" + str(r), weight = weight)
+                            G.add_edge("r" + str(r), "r" + str(i), weight = weight)
@@ -0,0 +1,89 @@
+import sys
+import json
+import time
+import pstats
+import logging
+import cProfile
+import contextlib
+
+### PARAMETERS ###############################################################
+
+# Logger of the progress messages. No handler is installed here, so when the
+# analyzer is imported by a batch script only the warnings are shown.
+logger = logging.getLogger("MapAnalyzer")
+
+### STRUCTS ##################################################################
+
+# Timers and counters collected during a run. The timers accumulate the time
+# and the number of calls of each phase, the counters the work done in them
+# (rays cast, Dijkstra searches, nodes and edges added).
+class Instrumentation:
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+        self.profiler = None
+
+    # Clears the timers and the counters.
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+
+    # Increments a counter.
+    def count(self, name, increment = 1):
+        self.counters[name] = self.counters.get(name, 0) + increment
+
+    # Adds the time elapsed in the block to a timer.
+    @contextlib.contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer = self.timers.setdefault(name, {"time": 0, "calls": 0})
+            timer["time"] = timer["time"] + time.perf_counter() - start
+            timer["calls"] = timer["calls"] + 1
+
+    # Logs the progress of a phase and times it.
+    @contextlib.contextmanager
+    def phase(self, name, message):
+        logger.info(message + "...")
+        with self.timer(name):
+            yield
+        logger.info("Done.")
+
+    # Starts profiling the run with cProfile.
+    def startProfiling(self):
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    # Stops profiling and dumps the statistics in a file readable by pstats.
+    # Returns the statistics.
+    def stopProfiling(self, filePath = None):
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler)
+        if filePath is not None:
+            stats.dump_stats(filePath)
+        self.profiler = None
+        return stats
+
+    # Returns the timers and the counters.
+    def toDict(self):
+        return {"timers": self.timers, "counters": self.counters}
+
+    # Exports the timers and the counters as JSON.
+    def exportJSON(self, filePath):
+        with open(filePath, "w") as f:
+            json.dump(self.toDict(), f, indent = 2)
+
+# Instrumentation shared by the analyzer functions.
+instrumentation = Instrumentation()
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Prints the progress messages of the analyzer on the standard output.
+def configureLogging(level = logging.INFO):
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
@@ -0,0 +1,206 @@
+from MapAnalysis.Instrumentation import instrumentation
+
+### STRUCTS ##################################################################
+
+class Room:
+    originX = None
+    originY = None
+    endX = None
+    endY = None
+    isCorridor = None
+    level = 0
+
+### INPUT/OUTPUT FUNCTIONS ###################################################
+
+# Reads the map.
+@instrumentation.phase("readMap", "Reading the map file")
+def readMap(filePath):
+    maps = []
+    with open(filePath) as f:
+        levels = f.read().split('\n\n')
+        for level in levels:
+            lines = level.split('\n')
+            maps.append([[lines[j][i] for i in range(len(lines[0]))] for j in range(len(lines))])
+    if (len(maps) == 1):
+        return maps[0]
+    else:
+        return maps
+
+# Reads the AB file.
+@instrumentation.phase("readAB", "Reading the AB file")
+def readAB(filePath):
+    with open(filePath) as f:
+        file = f.readline()
+
+        genomes = []
+        currentValue = ""
+        currentChar = 0
+        currentLevel = 0
+        rooms = []
+
+        # Extract the genomes.
+        while currentChar < len(file):
+            if (currentChar < len(file) - 1 and file[currentChar] == '|' and \
+                file[currentChar + 1] == '|'):
+                genomes.append(currentValue);
+                currentValue = ""
+                currentChar = currentChar + 1
+            elif (currentChar == len(file) - 1):
+                currentValue = currentValue + file[currentChar]
+                genomes.append(currentValue);
+            else:
+                currentValue = currentValue + file[currentChar]
+            currentChar = currentChar + 1
+
+        # Process each genome.
+        for genome in genomes:
+            currentValue = ""
+            currentChar = 0
+
+            while currentChar < len(genome) and genome[currentChar] == "<":
+                room = Room()
+                room.level = currentLevel
+                room.isCorridor = False
+                currentChar = currentChar + 1
+
+                # Get the x coordinate of the origin.
+                while genome[currentChar].isdigit():
+                    currentValue = currentValue + genome[currentChar]
+                    currentChar = currentChar + 1
+                room.originX = int(currentValue)
+
+                currentValue = ""
+                currentChar = currentChar + 1
+
+                # Get the y coordinate of the origin.
+                while genome[currentChar].isdigit():
+                    currentValue = currentValue + genome[currentChar]
+                    currentChar = currentChar + 1
+                room.originY = int(currentValue)
+
+                currentValue = ""
+                currentChar = currentChar + 1
+
+                # Get the size of the arena.
+                while genome[currentChar].isdigit():
+                    currentValue = currentValue + genome[currentChar]
+                    currentChar = currentChar + 1
+                room.endX = int(room.originX) + int(currentValue) - 1
+                room.endY = int(room.originY) + int(currentValue) - 1
+                rooms.append(room)
+
+                currentValue = ""
+                currentChar = currentChar + 1
+
+            if currentChar < len(genome) and genome[currentChar] == "|":
+                currentChar = currentChar + 1
+
+                while (currentChar < len(genome) and genome[currentChar] == "<"):
+                    room = Room()
+                    room.level = currentLevel
+                    room.isCorridor = True
+                    currentChar = currentChar + 1
+
+                    # Get the x coordinate of the origin.
+                    while genome[currentChar].isdigit():
+                        currentValue = currentValue + genome[currentChar]
+                        currentChar = currentChar + 1
+                    room.originX = int(currentValue)
+
+                    currentValue = ""
+                    currentChar = currentChar + 1
+
+                    # Get the y coordinate of the origin.
+                    while genome[currentChar].isdigit():
+                        currentValue = currentValue + genome[currentChar]
+                        currentChar = currentChar + 1
+                    room.originY = int(currentValue)
+
+                    currentValue = ""
+                    currentChar = currentChar + 1
+
+                    # If I am scanning a game element skip to next gene.
+                    if (genome[currentChar].isalpha() and genome[currentChar] != "-"):
+                        while (currentChar < len(genome) and genome[currentChar] != "<"):
+                            currentChar = currentChar + 1
+                    else:
+                        # Get the length of the corridor.
+                        if genome[currentChar] == "-":
+                            currentValue = currentValue + genome[currentChar]
+                            currentChar = currentChar + 1        
+                        while genome[currentChar].isdigit():
+                            currentValue = currentValue + genome[currentChar]
+                            currentChar = currentChar + 1
+                        if int(currentValue) > 0:
+                            room.endX = int(room.originX) + int(currentValue) - 1
+                            room.endY = int(room.originY) + 3 - 1
+                        else:
+                            room.endX = int(room.originX) + 3 - 1
+                            room.endY = int(room.originY) - int(currentValue) - 1
+                        rooms.append(room)
+
+                        currentValue = ""
+                        currentChar = currentChar + 1
+
+            currentLevel = currentLevel + 1
+
+    return rooms
+
+# Exports the map.
+@instrumentation.phase("exportMap", "Exporting the map")
+def exportMap(map, filePath):
+    mapString = ""
+
+    for x in range(len(map)):
+        for y in range(len(map[0])):
+            mapString = mapString + map[x][y]
+        if (x < len(map) - 1):
+            mapString = mapString + "\n"
+
+    file = open(filePath, "w")
+    file.write(mapString)
+    file.close()
+
+# Merges AB rooms.
+def mergeRooms(rooms):
+    mergedCount = 0
+
+    for room in rooms:
+        if not room.isCorridor:
+            nextRoom = next((nextRoom for nextRoom in rooms if (nextRoom.level == room.level and \
+                            nextRoom.originX > room.originX and nextRoom.originX <= room.endX + 1 and \
+                            nextRoom.originY == room.originY and nextRoom.endY == room.endY and \
+                            nextRoom.endY - nextRoom.originY == room.endY - room.originY)), None)
+            if nextRoom is not None and not nextRoom.isCorridor:
+                room.endX = nextRoom.endX
+                room.endY = nextRoom.endY
+                rooms.remove(nextRoom)
+                mergedCount = mergedCount + 1
+            else:
+                nextRoom = next((nextRoom for nextRoom in rooms if (nextRoom.level == room.level and \
+                                nextRoom.originY > room.originY and nextRoom.originY <= room.endY + 1 and \
+                                nextRoom.originX == room.originX and nextRoom.endX == room.endX and \
+                                nextRoom.endX - nextRoom.originX == room.endX - room.originX)), None)
+                if nextRoom is not None and not nextRoom.isCorridor:
+                    room.endX = nextRoom.endX
+                    room.endY = nextRoom.endY
+                    rooms.remove(nextRoom)
+                    mergedCount = mergedCount + 1
+    
+    if mergedCount == 0:
+        return
+    else:
+        mergeRooms(rooms)
+
+# Removes useless rooms.
+def removeRooms(rooms):
+    toBeRemoved = []
+
+    for r1 in rooms:
+        if (r1 not in toBeRemoved):
+            for r2 in rooms:
+                if r1 is not r2 and r1.level == r2.level and r1.originX <= r2.originX and \
+                    r1.originY <= r2.originY and r1.endX >= r2.endX and r1.endY >= r2.endY:
+                    toBeRemoved.append(r2)
+
+    return [r for r in rooms if r not in toBeRemoved]
@@ -0,0 +1,679 @@
+import math
+import hashlib
+import heapq
+import random
+import numpy as np
+import networkx as nx
+from collections import deque, OrderedDict
+from MapAnalysis.Instrumentation import logger, instrumentation
+from MapAnalysis.Support import subToInd, eulerianDistance
+from MapAnalysis.Graphs import getRoomsCorridorsGraph
+from MapAnalysis.Visibility import getVisibilityMatrix, addRoomVisibility, pruneRoomsByVisibility, \
+    getWallDistanceField
+
+### STRUCTS ##################################################################
+
+# Data of a map shared by the placement strategies: the map without objects,
+# the rooms and corridors graph, its metrics and the visibility matrix. It is 
+# never modified by the strategies, which work on their own placements. If 
+# pruneRooms is True the strategies only score the rooms which contain tiles
+# with the visibility they look for.
+class PlacementSession:
+    def __init__(self, map, rooms, visibilityError = None, useWallDistanceField = False, 
+                 pruneRooms = False):
+        with instrumentation.phase("objects", "Removing the pre-existing objects"):
+            self.map = [[("r" if not tile == "w" else tile) for tile in row] for row in map]
+
+        self.rooms = rooms
+        self.width = len(map)
+        self.height = len(map[0])
+        self.diagonal = math.sqrt(math.pow(self.width, 2) + math.pow(self.height, 2))
+        with instrumentation.timer("graph"):
+            self.roomGraph = getRoomsCorridorsGraph(rooms, False, map)
+        self.metrics = None
+        self.visibilityMatrix = None
+        self.wallDistanceField = None
+        self.visibilityError = visibilityError
+        self.useWallDistanceField = useWallDistanceField
+        self.pruneRooms = pruneRooms
+
+    # Returns the metrics of the rooms and corridors graph.
+    def getMetrics(self):
+        if self.metrics is None:
+            with instrumentation.timer("diameter"):
+                self.metrics = getRoomGraphMetrics(self.rooms, self.roomGraph)
+        return self.metrics
+
+    # Returns the visibility matrix, computing it the first time. The visibility
+    # aggregates of the rooms are added to the session graph at the same time.
+    def getVisibilityMatrix(self):
+        if self.visibilityMatrix is None:
+            with instrumentation.phase("visibility", "Computing the visibility matrix"):
+                self.visibilityMatrix = getVisibilityMatrix(self.map, self.visibilityError)
+            with instrumentation.timer("roomVisibility"):
+                addRoomVisibility(self.roomGraph, self.visibilityMatrix, self.map)
+        return self.visibilityMatrix
+
+    # Returns the distance of each tile from the closest wall, computing it the
+    # first time.
+    def getWallDistanceField(self):
+        if self.wallDistanceField is None:
+            with instrumentation.timer("wallDistance"):
+                self.wallDistanceField = getWallDistanceField(self.map)
+        return self.wallDistanceField
+
+    # Removes from a degree fit the rooms which contain no tile with a 
+    # visibility in the interval, if the pruning is enabled. The degree fit is
+    # kept whole if no room would be left.
+    def pruneDegreeFit(self, degreeFit, minimum, maximum):
+        if not self.pruneRooms:
+            return degreeFit
+        self.getVisibilityMatrix()
+        prunedFit = pruneRoomsByVisibility(self.roomGraph, degreeFit, minimum, maximum)
+        left = int(np.count_nonzero(~np.isnan(prunedFit[1])))
+        instrumentation.count("roomsPruned", int(np.count_nonzero(~np.isnan(degreeFit[1]))) - left)
+        return prunedFit if left > 0 else degreeFit
+
+    # Starts a new placement on top of the session data.
+    def newPlacement(self):
+        return Placement(self)
+
+# Objects placed by a strategy on top of a placement session. The rows of the 
+# map are shared with the session and copied only when an object is placed in
+# them, the graph is a copy of the session one.
+class Placement:
+    def __init__(self, session):
+        self.session = session
+        self.map = list(session.map)
+        self.roomGraph = session.roomGraph.copy()
+        self.placedObjects = []
+        # Degree fit used for each resource, in placement order.
+        self.degreeFits = []
+        # Visibility matrix used by the strategy, if any.
+        self.visibilityMatrix = None
+
+    # Returns the visibility matrix of the session and records that the 
+    # strategy uses it.
+    def getVisibilityMatrix(self):
+        self.visibilityMatrix = self.session.getVisibilityMatrix()
+        return self.visibilityMatrix
+
+    # Places a resource and returns its node.
+    def addResource(self, x, y, resource):
+        if self.map[x] is self.session.map[x]:
+            self.map[x] = list(self.map[x])
+        self.placedObjects.append([x, y, resource])
+        return addResource(x, y, resource, self.roomGraph, self.map)
+
+# Structural metrics of a rooms and corridors graph.
+class RoomGraphMetrics:
+    distances = None
+    eccentricity = None
+    diameter = None
+    normalizedDegree = None
+    deadEnds = None
+
+# Lazy max-heap of the room fitness used to select the best room across 
+# successive placements. The rooms are indexed as the nodes of the degree fit,
+# whose fitness is NaN for the rooms which are never selected. After a resource
+# is added only the rooms whose resource distance or resource redundancy 
+# changed are re-scored, the stale entries are discarded when they reach the 
+# top of the heap.
+class RoomQueue:
+    def __init__(self, graph, diameter, degreeFit, object, objects, weigths):
+        self.graph = graph
+        self.diameter = diameter
+        self.nodes, self.degreeFit = degreeFit
+        self.object = object
+        self.objects = objects
+        self.weigths = weigths
+        self.index = dict([(node, i) for i, node in enumerate(self.nodes)])
+        self.candidates = ~np.isnan(self.degreeFit)
+        self.version = np.zeros(len(self.nodes), dtype = int)
+        self.distance = np.full(len(self.nodes), diameter, dtype = float)
+        self.redundancy = np.zeros(len(self.nodes))
+
+        # Account for the resources which have already been placed.
+        for node, data in list(graph.nodes(data = True)):
+            if "resource" in data and data["resource"] in objects:
+                self.updateDistance(node)
+            if "resource" in data and data["resource"] == object[0]:
+                self.updateRedundancy(node)
+
+        self.heap = self.getEntries(np.flatnonzero(self.candidates))
+        heapq.heapify(self.heap)
+
+    # Computes the fitness of the rooms and returns their entries of the heap.
+    def getEntries(self, rooms):
+        self.version[rooms] = self.version[rooms] + 1
+        fitness = self.weigths[0] * self.degreeFit[rooms] + self.weigths[1] * \
+            (self.distance[rooms] / self.diameter) + self.weigths[2] * self.redundancy[rooms]
+        return list(zip((-fitness).tolist(), rooms.tolist(), self.version[rooms].tolist()))
+
+    # Updates the distance of the rooms from the closest resource and returns 
+    # the rooms whose distance changed.
+    def updateDistance(self, resourceNode):
+        instrumentation.count("dijkstraSearches")
+        lengths = nx.single_source_dijkstra_path_length(self.graph, resourceNode, weight = "weight")
+        # As in shortestPathLength, unreachable resources count as distance 0.
+        length = np.array([(lengths[node] if node in lengths else 0) for node in self.nodes], dtype = float)
+        changed = length < self.distance
+        self.distance = np.minimum(self.distance, length)
+        return changed
+
+    # Updates the redundancy of the rooms next to a resource of the object type 
+    # and returns them.
+    def updateRedundancy(self, resourceNode):
+        rooms = np.array([self.index[node] for node in self.graph[resourceNode] if node in self.index], 
+                         dtype = int)
+        self.redundancy[rooms] = self.redundancy[rooms] + 1 / self.object[1]
+        return rooms
+
+    # Re-scores the rooms affected by the placement of a resource.
+    def update(self, resourceNode):
+        data = self.graph.nodes[resourceNode]
+        changed = np.zeros(len(self.nodes), dtype = bool)
+        if data["resource"] in self.objects:
+            changed = self.updateDistance(resourceNode)
+        if data["resource"] == self.object[0]:
+            changed[self.updateRedundancy(resourceNode)] = True
+        for entry in self.getEntries(np.flatnonzero(changed & self.candidates)):
+            heapq.heappush(self.heap, entry)
+
+    # Returns the room with the highest fitness.
+    def getBestRoom(self):
+        while self.heap[0][2] != self.version[self.heap[0][1]]:
+            heapq.heappop(self.heap)
+        return self.nodes[self.heap[0][1]]
+
+### INPUT/OUTPUT FUNCTIONS ###################################################
+
+# Exports the data of a placement as a NumPy archive and renders the visibility
+# with the placed objects. The visibility is exported only if the strategy used
+# it, otherwise the image shows the walkable tiles. The degree fits are exported
+# only for the strategies which score the rooms by degree. They are computed on
+# the session graph, so they are aligned to its rooms, and the rooms without a 
+# fit are NaN.
+@instrumentation.phase("exportPlacement", "Exporting the placement data")
+def exportPlacementData(session, placement, filePath):
+    from MapAnalysis.Rendering import saveRasters, visibilityColormap
+
+    walls = np.array([[(tile == "w") for tile in row] for row in session.map], dtype = bool)
+    objects = np.array([object[0:2] for object in placement.placedObjects], dtype = int).reshape(-1, 2)
+    data = {"walls": walls, "objects": objects, 
+            "objectResources": np.array([object[2] for object in placement.placedObjects], dtype = str)}
+
+    if placement.visibilityMatrix is not None:
+        visibility = np.array(placement.visibilityMatrix, dtype = float)
+        data["visibility"] = visibility
+    else:
+        visibility = np.zeros(walls.shape)
+
+    if len(placement.degreeFits) > 0:
+        data["degreeFits"] = np.array([fit[1] for resource, fit in placement.degreeFits], dtype = float)
+        data["degreeFitResources"] = np.array([fit[0] for fit in placement.degreeFits], dtype = str)
+
+    np.savez_compressed(filePath + ".npz", **data)
+
+    visibility[walls] = np.nan
+    saveRasters(visibility[None], filePath + ".png", visibilityColormap, 
+                [(0, x, y, resource) for x, y, resource in placement.placedObjects])
+
+### GENERATION FUNCTIONS #####################################################
+
+# Adds all the objects to the map.
+@instrumentation.timer("addEverything")
+def addEverything(session, spawnPoint, medkit, ammo):
+    logger.info("Initializing the variables...")
+
+    placement = session.newPlacement()
+    roomGraph = placement.roomGraph
+    metrics = session.getMetrics()
+    diameter = metrics.diameter
+    diagonal = session.diagonal
+
+    visibilityMatrix = placement.getVisibilityMatrix()
+    wallDistanceField = session.getWallDistanceField() if session.useWallDistanceField else None
+    normalizedDegree = metrics.normalizedDegree
+    placedObjects = placement.placedObjects
+
+    logger.info("Done.")
+
+    # Place the spawn points.
+    logger.info("Placing the spawn points...")
+
+    degreeFit = session.pruneDegreeFit(getNormalizedDegreeFit(normalizedDegree, 0.1, 0.3), 0, 0.5)
+    placement.degreeFits.append((spawnPoint[0], degreeFit))
+    visibilityFit = [[(1 - visibilityMatrix[x][y]) for y in range(len(visibilityMatrix[0]))] 
+                     for x in range(len(visibilityMatrix))]
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, spawnPoint, [spawnPoint[0]], [1, 0.25, -2])
+
+    for i in range(spawnPoint[1]):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, spawnPoint, [spawnPoint[0]], 
+                               placedObjects, degreeFit, visibilityFit, [1, 0.25, -2], [1, 0.5, 0.5],
+                               roomQueue, wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], spawnPoint[0]))
+
+    logger.info("Done.")
+
+    # Place the medkits.
+    logger.info("Placing the medkits...")
+
+    degreeFit = session.pruneDegreeFit(getNormalizedDegreeFit(normalizedDegree, 0.3, 0.5), 0.25, 0.75)
+    placement.degreeFits.append((medkit[0], degreeFit))
+    visibilityFit = [[(1 - abs(0.5 - visibilityMatrix[x][y])) for y in range(len(visibilityMatrix[0]))]
+                     for x in range(len(visibilityMatrix))]
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, medkit, [spawnPoint[0], medkit[0]], [1, 0.25, 0])
+
+    for i in range(medkit[1]):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, medkit, [spawnPoint[0], medkit[0]], 
+            placedObjects, degreeFit, visibilityFit, [1, 0.25, 0], [1, 0.25, 0.5], roomQueue,
+            wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], medkit[0]))
+
+    logger.info("Done.")
+
+    # Place the ammo.
+    logger.info("Placing the ammo...")
+
+    degreeFit = session.pruneDegreeFit(getNormalizedDegreeFit(normalizedDegree, 0.2, 0.4), 0.5, 1)
+    placement.degreeFits.append((ammo[0], degreeFit))
+    visibilityFit = visibilityMatrix
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, ammo, [ammo[0], medkit[0]], [1, 0.25, 0])
+
+    for i in range(math.floor(ammo[1] / 2)):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, ammo, [ammo[0], medkit[0]], 
+                               placedObjects, degreeFit, visibilityFit, [1, 0.25, 0], 
+                               [1, 0.25, 0.5], roomQueue, wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], ammo[0]))
+
+    degreeFit = session.pruneDegreeFit(getNormalizedDegreeFit(normalizedDegree, 0.8, 0.9), 0.5, 1)
+    placement.degreeFits.append((ammo[0], degreeFit))
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, ammo, [ammo[0], medkit[0]], [1, 0.25, 0])
+
+    for i in range(math.ceil(ammo[1] / 2)):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, ammo, [ammo[0], medkit[0]], 
+                               placedObjects, degreeFit, visibilityFit, [1, 0.25, 0], [1, 0.25, 0.5],
+                               roomQueue, wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], ammo[0]))
+
+    logger.info("Done.")
+
+    return placement
+
+# Adds spawn points in safe locations.
+@instrumentation.timer("addSpawnPointsSafe")
+def addSpawnPointsSafe(session, spawnPoint):
+    logger.info("Initializing the variables...")
+
+    placement = session.newPlacement()
+    roomGraph = placement.roomGraph
+    metrics = session.getMetrics()
+    diameter = metrics.diameter
+    diagonal = session.diagonal
+
+    visibilityMatrix = placement.getVisibilityMatrix()
+    wallDistanceField = session.getWallDistanceField() if session.useWallDistanceField else None
+    normalizedDegree = discardNodes(metrics.normalizedDegree, metrics.deadEnds)
+    placedObjects = placement.placedObjects
+
+    logger.info("Done.")
+
+    # Place the spawn points.
+    logger.info("Placing the spawn points...")
+
+    degreeFit = session.pruneDegreeFit((normalizedDegree[0], 1 - normalizedDegree[1]), 0, 0.5)
+    placement.degreeFits.append((spawnPoint[0], degreeFit))
+    visibilityFit = [[(1 - visibilityMatrix[x][y]) for y in range(len(visibilityMatrix[0]))] 
+                     for x in range(len(visibilityMatrix))]
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, spawnPoint, [spawnPoint[0]], [1, 0.5, -2])
+
+    for i in range(spawnPoint[1]):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, spawnPoint, [spawnPoint[0]], 
+                               placedObjects, degreeFit, visibilityFit, [1, 0.5, -2], [1, 0.5, 0.5],
+                               roomQueue, wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], spawnPoint[0]))
+
+    logger.info("Done.")
+
+    return placement
+
+# Adds spawn points in unsafe locations.
+@instrumentation.timer("addSpawnPointsUnsafe")
+def addSpawnPointsUnsafe(session, spawnPoint):
+    logger.info("Initializing the variables...")
+
+    placement = session.newPlacement()
+    roomGraph = placement.roomGraph
+    metrics = session.getMetrics()
+    diameter = metrics.diameter
+    diagonal = session.diagonal
+
+    visibilityMatrix = placement.getVisibilityMatrix()
+    wallDistanceField = session.getWallDistanceField() if session.useWallDistanceField else None
+    normalizedDegree = discardNodes(metrics.normalizedDegree, metrics.deadEnds)
+    placedObjects = placement.placedObjects
+    deadEndCount = 0
+
+    logger.info("Done.")
+
+    # Place the spawn points.
+    logger.info("Placing the spawn points...")
+
+    degreeFit = session.pruneDegreeFit(getNormalizedDegreeFit(normalizedDegree, 0.8, 0.9), 0.5, 1)
+    placement.degreeFits.append((spawnPoint[0], degreeFit))
+    visibilityFit = visibilityMatrix
+
+    for node in metrics.deadEnds:
+        if deadEndCount < spawnPoint[1] / 2:
+            data = roomGraph.nodes[node]
+            candidateTiles = [(x, y, visibilityFit[x][y]) for x in range(data["originX"], data["endX"]) 
+                              for y in range(data["originY"], data["endY"])]
+            bestTile = max(candidateTiles, key = lambda x: x[2])
+            placement.addResource(bestTile[0], bestTile[1], spawnPoint[0])
+            deadEndCount = deadEndCount + 1
+
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, spawnPoint, [spawnPoint[0]], [1, 1.5, -2])
+
+    for i in range(spawnPoint[1] - deadEndCount):
+        bestTile = getBestTile(roomGraph, diameter, diagonal, spawnPoint, [spawnPoint[0]], 
+                               placedObjects, degreeFit, visibilityFit, [1, 1.5, -2], [1, 0.75, 0.75],
+                               roomQueue, wallDistanceField)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], spawnPoint[0]))
+
+    logger.info("Done.")
+
+    return placement
+
+# Adds spawn points in a random uniform way.
+@instrumentation.timer("addSpawnPointsUniformly")
+def addSpawnPointsUniformly(session, spawnPoint):
+    logger.info("Initializing the variables...")
+
+    placement = session.newPlacement()
+    roomGraph = placement.roomGraph
+    diagonal = session.diagonal
+
+    visibilityMatrix = placement.getVisibilityMatrix()
+    wallDistanceField = session.getWallDistanceField() if session.useWallDistanceField else None
+    placedObjects = placement.placedObjects
+    isolation = None
+
+    logger.info("Done.")
+
+    # Place the spawn points.
+    logger.info("Placing the spawn points...")
+
+    visibilityFit = [[(1 - visibilityMatrix[x][y]) for y in range(len(visibilityMatrix[0]))] 
+                     for x in range(len(visibilityMatrix))]
+    
+    for i in range(spawnPoint[1]):
+        if (len(placedObjects) > 0):
+            bestRoom = getMostIsolatedNode(roomGraph, spawnPoint[0], isolation)
+        else:
+            bestRoom = roomGraph.nodes[random.choice(list(roomGraph.nodes))]
+
+        candidateTiles = [(x, y, tileFit(x, y, visibilityFit[x][y], bestRoom["originX"], 
+                                         bestRoom["originY"], bestRoom["endX"], bestRoom["endY"], 
+                                         placedObjects, diagonal, [1, 0.5, 0.5], 
+                                         wallDistanceField[x][y] if wallDistanceField is not None 
+                                         else None)) 
+                          for x in range(bestRoom["originX"], bestRoom["endX"]) 
+                          for y in range(bestRoom["originY"], bestRoom["endY"])]
+        bestTile = max(candidateTiles, key = lambda x: x[2])
+        node = placement.addResource(bestTile[0], bestTile[1], spawnPoint[0])
+
+        # Update the isolation of the rooms with respect to the new spawn point.
+        if isolation is None:
+            isolation = getResourceIsolation(roomGraph, spawnPoint[0])
+        else:
+            updateResourceIsolation(roomGraph, isolation, node)
+
+    logger.info("Done.")
+
+    return placement
+
+# Adds spawn points in random locations.
+@instrumentation.timer("addSpawnPointsRandom")
+def addSpawnPointsRandom(session, spawnPoint):
+    logger.info("Initializing the variables...")
+
+    placement = session.newPlacement()
+    # The rooms are taken from the session graph, which contains no resources.
+    rooms = list(session.roomGraph.nodes)
+
+    logger.info("Done.")
+
+    # Place the spawn points.
+    logger.info("Placing the spawn points...")
+
+    for i in range(spawnPoint[1]):
+        room = session.roomGraph.nodes[random.choice(rooms)]
+        tile = [random.randint(room["originX"], room["endX"]), random.randint(room["originY"], room["endY"])]
+        placement.addResource(tile[0], tile[1], spawnPoint[0])
+
+    logger.info("Done.")
+
+    return placement
+
+# Adds a resource to the map and returns the node of the resource.
+def addResource(x, y, resource, roomGraph, map):
+    width = len(map)
+    height = len(map[0])
+
+    edges = roomGraph.number_of_edges()
+    roomGraph.add_node(subToInd(width, height, 0, x, y), x = x, y = y, resource = resource)
+
+    for node in roomGraph.nodes(data=True):
+        if "originX" in node[1] and x >= node[1]["originX"] and x <= node[1]["endX"] and \
+            y >= node[1]["originY"] and y <= node[1]["endY"]: roomGraph.add_edge(node[0], 
+            subToInd(width, height, 0, x, y), weight = eulerianDistance(node[1]["originX"] / 2 + 
+            node[1]["endX"] / 2, node[1]["originY"] / 2 + node[1]["endY"] / 2, x, y))
+
+    instrumentation.count("nodesAdded")
+    instrumentation.count("edgesAdded", roomGraph.number_of_edges() - edges)
+
+    map[x][y] = resource
+
+    return subToInd(width, height, 0, x, y)
+
+### METRICS FUNCTIONS ########################################################
+
+# Computes the diameter length.
+def getDiameterLength(roomGraph):
+    return max(getEccentricity(getAllPairsDistances(roomGraph)).values())
+
+# Computes the length of the shortest path between each pair of nodes.
+def getAllPairsDistances(roomGraph):
+    instrumentation.count("dijkstraSearches", roomGraph.number_of_nodes())
+    return dict(nx.all_pairs_dijkstra_path_length(roomGraph, weight = "weight"))
+
+# Computes the maximum distance of each node from the reachable nodes.
+def getEccentricity(distances):
+    return dict([(node, max(paths.values())) for node, paths in distances.items()])
+
+# Computes a hash of the content of a rooms list.
+def getRoomsHash(rooms):
+    content = ";".join([("%i,%i,%i,%i,%i,%i" % (room.level, room.originX, room.originY, room.endX, 
+                        room.endY, room.isCorridor)) for room in rooms])
+    return hashlib.md5(content.encode()).hexdigest()
+
+# Metrics of the rooms and corridors graphs, memoized by rooms hash. Only the
+# most recently used ones are kept, since the distances grow with the square of
+# the number of rooms.
+roomGraphMetricsCache = OrderedDict()
+
+# Maximum number of metrics kept in the cache.
+ROOM_GRAPH_METRICS_CACHE_SIZE = 4
+
+# Returns the structural metrics of the rooms and corridors graph generated 
+# from the rooms, computing them only the first time they are requested.
+def getRoomGraphMetrics(rooms, roomGraph):
+    key = getRoomsHash(rooms)
+
+    if key in roomGraphMetricsCache:
+        roomGraphMetricsCache.move_to_end(key)
+    else:
+        metrics = RoomGraphMetrics()
+        metrics.distances = getAllPairsDistances(roomGraph)
+        metrics.eccentricity = getEccentricity(metrics.distances)
+        metrics.diameter = max(metrics.eccentricity.values())
+        metrics.normalizedDegree = getNormalizedDegree(roomGraph)
+        # Dead ends are the rooms with at most one connection.
+        metrics.deadEnds = [deg[0] for deg in roomGraph.degree if deg[1] <= 1]
+        roomGraphMetricsCache[key] = metrics
+        if len(roomGraphMetricsCache) > ROOM_GRAPH_METRICS_CACHE_SIZE:
+            roomGraphMetricsCache.popitem(last = False)
+
+    return roomGraphMetricsCache[key]
+
+# Returns the nodes of a graph and an array with their degree, in the order in
+# which the nodes were added, so the rooms are sorted by index.
+def getDegrees(roomGraph):
+    nodes = [deg[0] for deg in roomGraph.degree]
+    return nodes, np.array([deg[1] for deg in roomGraph.degree], dtype = float)
+
+# Normalizes an array of values between 0 and 1, the NaN values are kept. If
+# all the values are equal they are normalized to 0.
+def normalizeArray(values):
+    if np.all(np.isnan(values)):
+        return values
+    minimum = np.nanmin(values)
+    span = np.nanmax(values) - minimum
+    return (values - minimum) / span if span > 0 else np.where(np.isnan(values), np.nan, 0)
+
+# Computes how far each value of an array is from the specified interval.
+def getIntervalDistances(minimum, maximum, values):
+    return np.maximum(minimum - values, 0) + np.maximum(values - maximum, 0)
+
+# Computes how much each node degree fits the specified interval. Returns the 
+# nodes and an array with their fitness.
+def getDegreeFit(roomGraph, minimum, maximum):
+    nodes, degrees = getDegrees(roomGraph)
+    return nodes, 1 - normalizeArray(getIntervalDistances(minimum, maximum, degrees))
+
+# Computes the normalized degree. Returns the nodes and an array with their 
+# normalized degree, which is NaN for the dead ends if they are discarded.
+def getNormalizedDegree(roomGraph, discardDeadEnds=False):
+    nodes, degrees = getDegrees(roomGraph)
+    normalizedDegree = normalizeArray(degrees)
+    if discardDeadEnds:
+        normalizedDegree = np.where(degrees > 1, normalizedDegree, np.nan)
+    return nodes, normalizedDegree
+
+# Computes how much each normalized degree fits the specified interval. The 
+# nodes without a normalized degree have no fitness.
+def getNormalizedDegreeFit(normalizedDegree, minimum, maximum):
+    nodes, values = normalizedDegree
+    return nodes, 1 - normalizeArray(getIntervalDistances(minimum, maximum, values))
+
+# Discards some nodes from a normalized degree or a degree fit, setting their 
+# value to NaN.
+def discardNodes(degree, discardedNodes):
+    nodes, values = degree
+    discarded = np.isin(np.array(nodes, dtype = str), np.array(discardedNodes, dtype = str))
+    return nodes, np.where(discarded, np.nan, values)
+
+### FITNESS FUNCTIONS ########################################################
+
+# Returns the distance of the closest room to the specified node which contains
+# one of the specified resources.
+def resourceDistance(graph, diameter, node, resources):
+    return min([(shortestPathLength(graph, node, sNode)) if "resource" in data and data["resource"] in resources \
+        else diameter for sNode, data in graph.nodes(data=True)]) / diameter
+
+# Returns how many resource of a give type are in the neighbourhood of the
+# node.
+def resourceRedundancy(graph, node, resource):
+    redundancy = 0
+    for neighbor in graph[node]:
+        if "resource" in graph.nodes[neighbor] and graph.nodes[neighbor]["resource"] is resource[0]:
+            redundancy = redundancy + 1 / resource[1]
+    return redundancy
+
+# Returns the fitness of a room.
+def roomFit(graph, diameter, node, degreeFit, object, objectList, weigths):
+    return weigths[0] * degreeFit + weigths[1] * resourceDistance(graph, diameter, node, objectList) \
+        + weigths[2] * resourceRedundancy(graph, node, object)
+
+# Returns the distance of a tile from the walls.
+def wallDistace(originX, originY, endX, endY, x, y):
+    return (min([abs(originX - x), abs(endX - x)]) + min([abs(originY - y),
+        abs(endY - y)])) / ((endX - originX) / 2 + (endY - originY) / 2)
+
+# Returns the distance of a tile from the closest placed object.
+def objectDistance(x, y, placedObjects, diagonal):
+    return min([(eulerianDistance(x, y, object[0], object[1])) for object in placedObjects]) / diagonal \
+        if len(placedObjects) > 0 else 0
+
+# Returns the fitness of a tile. If the wall distance of the tile is provided it
+# replaces the one computed from the bounds of the room.
+def tileFit(x, y, visibility, originX, originY, endX, endY, placedObjects, diagonal, weigths, 
+            wallDistance = None):
+    if wallDistance is None:
+        wallDistance = wallDistace(originX, originY, endX, endY, x, y)
+    return weigths[0] * visibility + weigths[1] * wallDistance + \
+        weigths[2] * objectDistance(x, y, placedObjects, diagonal)
+
+# Returns the best tile. If a room queue is provided the best room is taken from
+# it, otherwise all the rooms are scored. If a wall distance field is provided
+# it is used for the wall distance of the tiles.
+def getBestTile(graph, diameter, diagonal, object, objects, placedObjects, degreeFit, visibilityFit, 
+                roomWeigths, tileWeigths, roomQueue = None, wallDistanceField = None):
+    if roomQueue is not None:
+        bestRoom = graph.nodes[roomQueue.getBestRoom()]
+    else:
+        nodes, fitness = degreeFit
+        candidateRooms = [(nodes[i], roomFit(graph, diameter, nodes[i], fitness[i], object, objects, 
+                          roomWeigths)) for i in np.flatnonzero(~np.isnan(fitness))]
+        bestRoom = graph.nodes[max(candidateRooms, key = lambda x: x[1])[0]]
+    candidateTiles = [(x, y, tileFit(x, y, visibilityFit[x][y], bestRoom["originX"], bestRoom["originY"], 
+                      bestRoom["endX"], bestRoom["endY"], placedObjects, diagonal, tileWeigths,
+                      wallDistanceField[x][y] if wallDistanceField is not None else None)) 
+                      for x in range(bestRoom["originX"], bestRoom["endX"]) 
+                      for y in range(bestRoom["originY"], bestRoom["endY"])]
+    return max(candidateTiles, key = lambda x: x[2])
+
+# Returns the node which has the maximum minimum distance from the resource
+# nodes. The isolation can be provided to avoid recomputing it.
+def getMostIsolatedNode(graph, resource, isolation = None):
+    if isolation is None:
+        isolation = getResourceIsolation(graph, resource)
+    nodes = [(node, isolation[node] if node in isolation else math.inf) 
+             for node, data in graph.nodes(data = True) if ("resource" not in data)]
+    return graph.nodes[max(nodes, key = lambda x: x[1])[0]]
+
+# Returns the number of hops between each node and the closest node which 
+# contains the resource, computed with a single multi-source search.
+def getResourceIsolation(graph, resource):
+    sources = [node for node, data in graph.nodes(data = True) if ("resource" in data and 
+               data["resource"] == resource)]
+    if len(sources) == 0:
+        return {}
+    instrumentation.count("dijkstraSearches")
+    return nx.multi_source_dijkstra_path_length(graph, sources, weight = lambda u, v, data: 1)
+
+# Updates the isolation after a node containing the resource has been added,
+# visiting only the nodes which get closer to the resource.
+def updateResourceIsolation(graph, isolation, resourceNode):
+    isolation[resourceNode] = 0
+    queue = deque([resourceNode])
+    while len(queue) > 0:
+        node = queue.popleft()
+        for neighbor in graph[node]:
+            if isolation[node] + 1 < (isolation[neighbor] if neighbor in isolation else math.inf):
+                isolation[neighbor] = isolation[node] + 1
+                queue.append(neighbor)
+
+# Computes the shortest path length between two nodes menaging the exception.
+def shortestPathLength(graph, n1, n2):
+    instrumentation.count("dijkstraSearches")
+    try: 
+        return nx.shortest_path_length(graph, n1, n2, "weight")
+    except:
+        return 0
@@ -0,0 +1,189 @@
+import numpy as np
+import networkx as nx
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LinearSegmentedColormap
+from MapAnalysis.Instrumentation import logger
+from MapAnalysis.Support import blendColor
+from MapAnalysis.Graphs import minMaxVisibility
+
+### PLOT FUNCTIONS ###########################################################
+
+# Gets the maximum level of the nodes of a graph.
+def getMaxNodeLevel(G):
+    return max([(data["level"] if "level" in data else 0) for node, data in G.nodes(data = True)] + [0])
+
+# Plots the graph.
+def plotRoomsCorridorsGraph(G):
+    import matplotlib.pyplot as plt
+    print("\n[CLOSE THE GRAPH TO CONTNUE]")
+    pos = dict([(node, (data["originX"] / 2 + data["endX"] / 2, data["originY"] / 2 + data["endY"] / 2)) 
+                for node, data in G.nodes(data=True)])
+    # edge_labels = dict([(key, "{:.2f}".format(value)) for key, value in
+    # nx.get_edge_attributes(G,'weight').items()])
+    maxLevel = getMaxNodeLevel(G)
+    colors = [(blendColor('#f44242', '#2EAA2E', data["level"] / maxLevel if maxLevel > 0 else 0)) 
+              for node, data in G.nodes(data=True)]
+    node_labels = dict([(node, node) for node in G.nodes(data = False)])
+    nx.draw_networkx_labels(G, pos, labels = node_labels)
+    nx.draw(G, pos, node_color = colors, node_size = 75, node_shape = ",")
+    # nx.draw_networkx_edge_labels(G, pos, edge_labels = edge_labels)
+    plt.axis('equal')
+    plt.show()
+
+# Plots the graph.
+def plotRoomsCorridorsObjectsGraph(G):
+    import matplotlib.pyplot as plt
+    print("\n[CLOSE THE GRAPH TO CONTNUE]")
+    pos = dict([(node, (data["originX"] / 2 + data["endX"] / 2, data["originY"] / 2 + data["endY"] / 2) 
+                 if "originX" in data else (data["x"], data["y"])) for node, data  in G.nodes(data=True)])
+    # edge_labels = dict([(key, "{:.2f}".format(value)) for key, value in
+    # nx.get_edge_attributes(G,'weight').items()])
+    maxLevel = getMaxNodeLevel(G)
+    colors = [(blendColor('#f44242', '#2EAA2E', data["level"] / maxLevel if maxLevel > 0 else 0) 
+              if "originX" in data else blendColor("#0079a2", '#a20079', data["level"] / maxLevel 
+              if maxLevel > 0 else 0)) for node, data in G.nodes(data=True)]
+    node_labels = dict([(node, node) if "resource" not in data else (node, data["resource"]) for node, 
+                        data in G.nodes(data = True)])
+    nx.draw_networkx_labels(G, pos, labels = node_labels)
+    nx.draw(G, pos, node_color = colors, node_size = 75, node_shape = ",")
+    # nx.draw_networkx_edge_labels(G, pos, edge_labels = edge_labels)
+    plt.axis('equal')
+    plt.show()
+
+# Plots the graph.
+def plotTilesGraph(G):
+    import matplotlib.pyplot as plt
+    print("\n[CLOSE THE GRAPH TO CONTNUE]")
+    pos = dict([(node, (data["x"], data["y"])) for node, data  in G.nodes(data=True)])
+    maxLevel = getMaxNodeLevel(G)
+    colors = [(blendColor('#f44242', '#2EAA2E', data["level"] / maxLevel if maxLevel > 0 else 0)) 
+              for node, data in G.nodes(data=True)]
+    node_labels = dict([(node, data["char"]) for node, data in G.nodes(data = True) 
+                        if data["char"] != "w" and data["char"] != "r" and data["char"] != "d" 
+                        and data["char"].islower()])
+    nx.draw_networkx_labels(G, pos, labels = node_labels)
+    nx.draw(G, pos, node_color = colors, node_size = 75, node_shape = ",", 
+            alpha = (2 / (maxLevel + 1) if maxLevel > 0 else 1), arrowstyle = "fancy")
+    plt.axis('equal')
+    plt.show()
+
+# Plots the graph.
+def plotVisibilityGraph(G):
+    import matplotlib.pyplot as plt
+    print("\n[CLOSE THE GRAPH TO CONTNUE]")
+    minC, maxC = minMaxVisibility(G)
+    colors = [(blendColor("#0000ff", "#ff0000", (data["visibility"] - minC) / (maxC - minC))) 
+              for node, data in G.nodes(data=True)]
+    pos = dict([ (node, (data["x"], data["y"])) for node, data in G.nodes(data=True)])
+    nx.draw_networkx_nodes(G, pos, node_color = colors, node_size = 75, node_shape = ",")
+    # node_labels = nx.get_node_attributes(G,'visibility')
+    # nx.draw_networkx_labels(G, pos, labels = node_labels)
+    plt.axis('equal')
+    plt.show()
+
+# Plots the graph.
+def plotOutlinesGraph(G):
+    import matplotlib.pyplot as plt
+    print("\n[CLOSE THE GRAPH TO CONTNUE]")
+    maxLevel = getMaxNodeLevel(G)
+    colors = [(blendColor('#f44242', '#2EAA2E', data["level"] / maxLevel if maxLevel > 0 else 0))
+              for node, data in G.nodes(data=True)]
+    nx.draw(G, dict([ (node, (data["x"], data["y"])) for node, data  in G.nodes(data=True)]),
+            node_color = colors, node_size = 75, node_shape = ",", alpha = (2 / (maxLevel + 1)
+                                                                            if maxLevel > 0 else 1))
+    plt.axis('equal')
+    plt.show()
+
+### RENDER FUNCTIONS #########################################################
+
+# Colormaps of the rendered images, they blend the same colors of the plots.
+levelColormap = LinearSegmentedColormap.from_list("level", ["#f44242", "#2EAA2E"])
+resourceColormap = LinearSegmentedColormap.from_list("resource", ["#0079a2", "#a20079"])
+visibilityColormap = LinearSegmentedColormap.from_list("visibility", ["#0000ff", "#ff0000"])
+
+# Returns the level of each node divided by the maximum level.
+def getNormalizedLevels(G):
+    levels = np.array([(data["level"] if "level" in data else 0) for node, data in G.nodes(data = True)], 
+                      dtype = float)
+    maxLevel = levels.max() if len(levels) > 0 else 0
+    return levels / maxLevel if maxLevel > 0 else np.zeros(len(levels))
+
+# Returns the position of each node, which is the center for the rooms and the
+# tile for the other nodes.
+def getNodePositions(G):
+    return np.array([((data["originX"] / 2 + data["endX"] / 2, data["originY"] / 2 + data["endY"] / 2) 
+                      if "originX" in data else (data["x"], data["y"])) for node, data in G.nodes(data = True)],
+                    dtype = float).reshape(-1, 2)
+
+# Rasterizes the values of the tile nodes in an array with an image for each 
+# level. The tiles without a node are NaN.
+def getTileRasters(G, values):
+    nodes = [data for node, data in G.nodes(data = True)]
+    x = np.array([data["x"] for data in nodes], dtype = int)
+    y = np.array([data["y"] for data in nodes], dtype = int)
+    level = np.array([(data["level"] if "level" in data else 0) for data in nodes], dtype = int)
+    rasters = np.full((level.max() + 1, x.max() + 1, y.max() + 1), np.nan)
+    rasters[level, x, y] = values
+    return rasters
+
+# Saves the rasters of the levels side by side. Each label is a tuple (level, 
+# x, y, text).
+def saveRasters(rasters, filePath, colormap, labels = []):
+    fig = Figure(figsize = (6 * len(rasters), 6))
+    for i in range(len(rasters)):
+        ax = fig.add_subplot(1, len(rasters), i + 1)
+        # The x coordinate grows to the right and the y one upwards, as in the plots.
+        ax.imshow(rasters[i].T, origin = "lower", cmap = colormap, vmin = 0, vmax = 1, 
+                  interpolation = "nearest")
+        for level, x, y, text in labels:
+            if level == i:
+                ax.text(x, y, text, ha = "center", va = "center", fontsize = 6)
+        if len(rasters) > 1:
+            ax.set_title("Level %i" % i)
+        ax.set_axis_off()
+    fig.savefig(filePath, dpi = 150, bbox_inches = "tight")
+
+# Returns the labels of the game elements of a tile graph.
+def getResourceLabels(G):
+    return [((data["level"] if "level" in data else 0), data["x"], data["y"], data["char"]) 
+            for node, data in G.nodes(data = True) if data["char"] != "w" and data["char"] != "r" 
+            and data["char"] != "d" and data["char"].islower()]
+
+# Renders the tiles graph as an image, coloring the tiles by level.
+def renderTilesGraph(G, filePath):
+    logger.info("Rendering the graph...")
+    saveRasters(getTileRasters(G, getNormalizedLevels(G)), filePath, levelColormap, getResourceLabels(G))
+    logger.info("Done.")
+
+# Renders the visibility graph as an image, coloring the tiles by visibility.
+def renderVisibilityGraph(G, filePath):
+    logger.info("Rendering the graph...")
+    visibility = np.array([data["visibility"] for node, data in G.nodes(data = True)], dtype = float)
+    span = visibility.max() - visibility.min()
+    visibility = (visibility - visibility.min()) / span if span > 0 else np.zeros(len(visibility))
+    saveRasters(getTileRasters(G, visibility), filePath, visibilityColormap)
+    logger.info("Done.")
+
+# Renders a graph whose nodes are rooms, resources or outline vertices as an 
+# image. The edges are drawn as a single collection of segments.
+def renderGraph(G, filePath):
+    logger.info("Rendering the graph...")
+    nodes = list(G.nodes(data = True))
+    index = dict([(node[0], i) for i, node in enumerate(nodes)])
+    positions = getNodePositions(G)
+    levels = getNormalizedLevels(G)
+    isRoom = np.array([("resource" not in data) for node, data in nodes], dtype = bool)
+    colors = np.where(isRoom[:, None], levelColormap(levels), resourceColormap(levels))
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype = int).reshape(-1, 2)
+
+    fig = Figure(figsize = (8, 8))
+    ax = fig.add_subplot(1, 1, 1)
+    ax.add_collection(LineCollection(positions[edges], colors = "k", linewidths = 0.5, zorder = 1))
+    ax.scatter(positions[:, 0], positions[:, 1], c = colors, s = 20, marker = "s", zorder = 2)
+    for i in np.flatnonzero(~isRoom):
+        ax.text(positions[i, 0], positions[i, 1], nodes[i][1]["resource"], fontsize = 6, zorder = 3)
+    ax.set_aspect("equal")
+    ax.set_axis_off()
+    fig.savefig(filePath, dpi = 150, bbox_inches = "tight")
+    logger.info("Done.")
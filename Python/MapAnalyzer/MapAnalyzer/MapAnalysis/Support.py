@@ -0,0 +1,102 @@
+import math
+from MapAnalysis.Instrumentation import logger
+
+### SUPPORT FUNCTIONS ########################################################
+
+# Returns the indices of the rooms which contain a coordinate.
+def getRoomsContainingCoord(x, y, level, rooms):
+    containers = []
+    for r in range(len(rooms)):
+        if (rooms[r].level == level and rooms[r].originX <= x and rooms[r].endX >= x 
+            and rooms[r].originY <= y and rooms[r].endY >= y):
+            containers.append(r)
+            logger.debug("[" + str(x) + ", " + str(y) + "] contained in room r" + str(r) + "." )
+    return containers
+
+# Tells if it is possible to jump from a room to another.
+def canJumpFromTo(rf, rt):
+    return (not (rf.originX >= rt.endX + 1 or rt.originX >= rf.endX + 1) and 
+            not (rf.originY >= rt.endY + 1 or rt.originY >= rf.endY + 1) and
+            not (rf.originX <= rt.originX and rf.originY <= rt.originY 
+                 and rf.endX >= rt.endX and rf.endY >= rt.endY))
+
+# Makes alle the edges in a graph bi-directional.
+def makeBidirectional(G):
+    reversed = G.reverse()
+    G.add_edges_from(reversed.edges)
+
+# Tells if the current map is multilevel.
+def isMultilevel(rooms):
+    for room in rooms:
+        if room.level > 0:
+            return True;
+    return False;
+
+# Tells if a tile is inside the map bounds.
+def isInMapRange(x, y, map):
+    if (x < len(map[0]) and y < len(map)):
+        return True
+    else:
+        return False
+
+# Converts from subscript to linear index.
+def subToInd(width, height, level, rows, cols):
+    return rows * width + cols + level * width * height
+
+# Converts from linear to subscript index.
+def indToSub(width, height, level, ind):
+    rows = ((ind.astype('int') - level * width * height) / width)
+    cols = ((ind.astype('int') - level * width * height) % width)
+    return (rows, cols)
+
+# Computes the eulerian distance.
+def eulerianDistance(x1, y1, x2, y2):
+    return math.sqrt(math.pow(x1 - x2, 2) + math.pow(y1 - y2, 2))
+
+# Blends from a value to another.
+def blend(a, b, alpha):
+  return (1 - alpha) * a + alpha * b
+
+# Coverts from hex to RGB.
+def RGBToHex(r, g, b):
+    return '#%02x%02x%02x' % (int(r), int(g), int(b))
+
+# Converts from RGB to hex.
+def hexToRGB(hex):
+    h = hex.lstrip('#')
+    RGB = tuple(int(h[i : i + 2], 16) for i in (0, 2 ,4))
+    return RGB[0], RGB[1], RGB[2]
+
+# Blends a color.
+def blendColor(h1, h2, alpha):
+    r1, g1, b1 = hexToRGB(h1)
+    r2, g2, b2 = hexToRGB(h2)
+    return RGBToHex(blend(r1, r2, alpha), blend(g1, g2, alpha), blend(b1, b2, alpha))
+
+# Darkens a color.
+def darkenColor(h, d):
+    r, g, b = hexToRGB(h)
+    r = r - r * d
+    g = g - r * d
+    b = b - r * d
+    return RGBToHex(r, g, b)
+
+# Tells how well a value fits in an interval.
+def intervalDistance(min, max, value):
+    #return abs(abs(min) - abs(value)) + abs(abs(max) - abs(value))
+    if (value >= min and value <= max):
+        return 0
+    elif (value < min):
+        return abs(min - value)
+    else:
+        return abs(value - max)
+
+# Gets maximum level.
+def getMaxLevel(rooms):
+    max = 0
+
+    for room in rooms:
+        if room.level > max:
+            max = room.level
+
+    return max
@@ -0,0 +1,270 @@
+import math
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from MapAnalysis.Instrumentation import instrumentation
+
+### VISIBILITY FUNCTIONS #####################################################
+
+# Computes a matrix where each cell is the visibility of that cell in the map
+# with respect to the visibility of the other cells, which is the number of 
+# walkable tiles visible from it. Each pair of tiles is checked only once. If 
+# an error is specified the visibility of a tile is estimated casting rays 
+# towards a random sample of the other tiles, large enough for the normalized
+# visibility of all the tiles to be within the error from the exact one with 
+# the specified confidence.
+def getVisibilityMatrix(map, error = None, confidence = 0.95, seed = 0):
+    walls = np.array(map) == "w"
+    tiles = np.argwhere(~walls)
+    count = len(tiles)
+
+    if error is None:
+        visibility = getExactVisibility(walls, tiles)
+    else:
+        visibility = getSampledVisibility(walls, tiles, error, confidence, seed)
+
+    # The walls have visibility 0 before the normalization.
+    visibilityMap = np.zeros(walls.shape)
+    visibilityMap[tiles[:, 0], tiles[:, 1]] = visibility
+    minimum = visibility.min() if count > 0 else 0
+    span = visibility.max() - minimum if count > 0 else 0
+    visibilityMap = (visibilityMap - minimum) / span if span > 0 else np.zeros(walls.shape)
+
+    return visibilityMap.tolist()
+
+# Returns the number of tiles visible from each tile, checking all the pairs.
+def getExactVisibility(walls, tiles):
+    count = len(tiles)
+    visibility = np.zeros(count)
+
+    for first, second in getTilePairs(count):
+        visible = areTilesVisible(walls, tiles[first, 0], tiles[first, 1], tiles[second, 0], 
+                                  tiles[second, 1])
+        visibility = visibility + np.bincount(first[visible], minlength = count) + \
+            np.bincount(second[visible], minlength = count)
+        instrumentation.count("raysCast", len(first))
+
+    return visibility
+
+# Estimates the number of tiles visible from each tile from the visible 
+# fraction of a sample of the other tiles. If the visible fractions are within
+# a distance d from the exact ones, the normalized visibility of each tile is 
+# within 2d divided by the estimated span of the fractions. Rays are added in 
+# rounds, sized on the span estimated so far, until this bound is within the 
+# error. The first round only casts a few rays to estimate the span. The noise
+# of the fractions widens the estimated span, so the rounds are sized on the
+# span reduced by the current bound. Each round holds for all the tiles with a
+# share of the confidence, and the shares of the rounds add up to it. When the
+# rays would cost as much as checking all the pairs the exact visibility is 
+# computed instead.
+def getSampledVisibility(walls, tiles, error, confidence, seed):
+    count = len(tiles)
+    generator = np.random.default_rng(seed)
+    visible = np.zeros(count)
+    samples = 0
+    rounds = 0
+    span = 1
+
+    while count > 1:
+        rounds = rounds + 1
+        roundConfidence = 1 - (1 - confidence) / (count * math.pow(2, rounds))
+        needed = max(getVisibilitySamples(error * span / 2, roundConfidence), samples + 1) \
+            if span > 0 else count
+        if rounds == 1:
+            needed = min(needed, VISIBILITY_PILOT_RAYS)
+        # The exact visibility checks each pair once, half a ray for each tile.
+        if needed > (count - 1) / 2:
+            break
+        visible = visible + castSampledRays(walls, tiles, needed - samples, generator)
+        samples = needed
+        fractions = visible / samples
+        span = fractions.max() - fractions.min()
+        bound = getVisibilityBound(samples, roundConfidence)
+        if 2 * bound <= error * span:
+            return fractions * (count - 1)
+        span = span - bound
+
+    return getExactVisibility(walls, tiles)
+
+# Casts the specified number of rays from each tile towards random other tiles
+# and returns how many of them reach their target.
+def castSampledRays(walls, tiles, rays, generator):
+    count = len(tiles)
+    visible = np.zeros(count)
+    chunkSize = max(1, VISIBILITY_CHUNK_SIZE // rays)
+
+    for start in range(0, count, chunkSize):
+        first = np.repeat(np.arange(start, min(start + chunkSize, count)), rays)
+        # Skip the tile itself.
+        second = generator.integers(0, count - 1, len(first))
+        second = second + (second >= first)
+        hits = areTilesVisible(walls, tiles[first, 0], tiles[first, 1], tiles[second, 0], tiles[second, 1])
+        visible = visible + np.bincount(first[hits], minlength = count)
+        instrumentation.count("raysCast", len(first))
+
+    return visible
+
+# Maximum number of tile pairs checked at once by the visibility functions.
+VISIBILITY_CHUNK_SIZE = 1 << 20
+
+# Rays cast from each tile to estimate the span of the visible fractions before
+# sizing the sample.
+VISIBILITY_PILOT_RAYS = 64
+
+# Generates the pairs (i, j) with i < j of a number of tiles, as two arrays 
+# containing at most VISIBILITY_CHUNK_SIZE pairs.
+def getTilePairs(count):
+    start = 0
+    while start < count:
+        end = start + 1
+        size = count - start - 1
+        while end < count and size + count - end - 1 <= VISIBILITY_CHUNK_SIZE:
+            size = size + count - end - 1
+            end = end + 1
+        sources = np.arange(start, end)
+        pairs = count - sources - 1
+        first = np.repeat(sources, pairs)
+        # The second tile of the pairs of each source goes from the source + 1 on.
+        second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+        yield first, second
+        start = end
+
+# Returns the number of rays needed for the visible fraction of the targets of
+# a tile to be within the error from the exact one with the specified 
+# confidence, according to the Hoeffding inequality.
+def getVisibilitySamples(error, confidence):
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * math.pow(error, 2)))
+
+# Returns the distance within which the visible fraction of the targets of a 
+# tile is from the exact one with the specified confidence, given the number 
+# of rays, according to the Hoeffding inequality.
+def getVisibilityBound(samples, confidence):
+    return math.sqrt(math.log(2 / (1 - confidence)) / (2 * samples))
+
+# Compares the approximated visibility matrix of a map with the exact one and
+# returns the mean and the maximum absolute difference of the normalized 
+# visibility.
+def getVisibilityError(map, error, confidence = 0.95, seed = 0):
+    exact = getVisibilityMatrix(map)
+    approximated = getVisibilityMatrix(map, error, confidence, seed)
+    differences = [abs(exact[x][y] - approximated[x][y]) for x in range(len(map)) 
+                   for y in range(len(map[0])) if not map[x][y] == "w"]
+    return sum(differences) / len(differences), max(differences)
+
+# Adds to each room of the graph the mean, the maximum and the minimum 
+# visibility of the tiles considered when placing an object in it, and the 
+# number of rooms whose center is visible from its center. The visibility 
+# between two rooms is a single ray between their centers, it does not account
+# for the other tiles of the rooms.
+def addRoomVisibility(roomGraph, visibilityMatrix, map):
+    rooms = [(node, data) for node, data in roomGraph.nodes(data = True) if "originX" in data]
+    centers = np.array([(int(data["originX"] / 2 + data["endX"] / 2), int(data["originY"] / 2 + 
+                         data["endY"] / 2)) for node, data in rooms], dtype = int).reshape(-1, 2)
+
+    for node, data in rooms:
+        visibility = [visibilityMatrix[x][y] for x in range(data["originX"], data["endX"]) 
+                      for y in range(data["originY"], data["endY"])]
+        # Rooms too small to contain candidate tiles have no visibility.
+        if len(visibility) > 0:
+            data["visibilityMean"] = sum(visibility) / len(visibility)
+            data["visibilityMax"] = max(visibility)
+            data["visibilityMin"] = min(visibility)
+        else:
+            data["visibilityMean"] = data["visibilityMax"] = data["visibilityMin"] = 0
+        data["visibleRooms"] = 0
+
+    walls = np.array(map) == "w"
+    # The rooms whose center is a wall see no other room.
+    openRooms = np.flatnonzero(~walls[centers[:, 0], centers[:, 1]])
+    visibleRooms = np.zeros(len(rooms), dtype = int)
+    for first, second in getTilePairs(len(openRooms)):
+        first, second = openRooms[first], openRooms[second]
+        visible = areTilesVisible(walls, centers[first, 0], centers[first, 1], centers[second, 0], 
+                                  centers[second, 1])
+        visibleRooms = visibleRooms + np.bincount(first[visible], minlength = len(rooms)) + \
+            np.bincount(second[visible], minlength = len(rooms))
+        instrumentation.count("raysCast", len(first))
+
+    for i in range(len(rooms)):
+        rooms[i][1]["visibleRooms"] = int(visibleRooms[i])
+
+# Removes from the degree fit the rooms which contain no tile with a 
+# visibility in the specified interval, setting their fitness to NaN so that 
+# they are never scored. The rooms without the visibility aggregates are kept.
+def pruneRoomsByVisibility(roomGraph, degreeFit, minimum, maximum):
+    nodes, fitness = degreeFit
+    maxima = np.array([roomGraph.nodes[node].get("visibilityMax", maximum) for node in nodes], dtype = float)
+    minima = np.array([roomGraph.nodes[node].get("visibilityMin", minimum) for node in nodes], dtype = float)
+    return nodes, np.where((maxima >= minimum) & (minima <= maximum), fitness, np.nan)
+
+# Wall distance fields of the maps, memoized by map hash. Only the most
+# recently used ones are kept, since each one holds a value per tile.
+wallDistanceFieldCache = OrderedDict()
+
+# Maximum number of wall distance fields kept in the cache.
+WALL_DISTANCE_FIELD_CACHE_SIZE = 4
+
+# Returns the distance of each tile from the closest wall divided by the 
+# maximum one. Unlike wallDistace, it accounts for the actual walls instead of
+# the bounds of the room.
+def getWallDistanceField(map):
+    from scipy.ndimage import distance_transform_edt
+
+    key = hashlib.md5("\n".join(["".join(row) for row in map]).encode()).hexdigest()
+
+    if key in wallDistanceFieldCache:
+        wallDistanceFieldCache.move_to_end(key)
+    else:
+        distance = distance_transform_edt(np.array(map) != "w")
+        maximum = distance.max()
+        wallDistanceFieldCache[key] = (distance / maximum if maximum > 0 else distance).tolist()
+        if len(wallDistanceFieldCache) > WALL_DISTANCE_FIELD_CACHE_SIZE:
+            wallDistanceFieldCache.popitem(last = False)
+
+    return wallDistanceFieldCache[key]
+
+### LINE OF SIGHT FUNCTIONS ##################################################
+
+# Tells if a tile is visible from another tile. The segment between the 
+# centers of the tiles is walked one step at a time along its major axis with 
+# integer arithmetic, rounding to the closest tile, and none of the tiles 
+# between the two can be a wall. The segment is always walked from the first 
+# tile in row-major order, so the visibility is symmetric.
+def isTileVisible(x1, y1, x2, y2, map):
+    if (x1, y1) > (x2, y2):
+        x1, y1, x2, y2 = x2, y2, x1, y1
+
+    dx = x2 - x1
+    dy = y2 - y1
+    n = max(abs(dx), abs(dy))
+
+    for k in range(1, n):
+        if map[x1 + (2 * k * dx + n) // (2 * n)][y1 + (2 * k * dy + n) // (2 * n)] == 'w':
+            return False
+    
+    return True
+
+# Tells which pairs of tiles are visible from each other, like isTileVisible
+# but for arrays of coordinates. The walls are a boolean matrix. At each step 
+# only the pairs which are still visible and whose segment is not over are 
+# checked.
+def areTilesVisible(walls, x1, y1, x2, y2):
+    swap = (x1 > x2) | ((x1 == x2) & (y1 > y2))
+    x1, x2 = np.where(swap, x2, x1), np.where(swap, x1, x2)
+    y1, y2 = np.where(swap, y2, y1), np.where(swap, y1, y2)
+
+    dx = x2 - x1
+    dy = y2 - y1
+    n = np.maximum(np.abs(dx), np.abs(dy))
+    visible = np.ones(len(n), dtype = bool)
+    active = np.flatnonzero(n > 1)
+
+    k = 1
+    while len(active) > 0:
+        x = x1[active] + (2 * k * dx[active] + n[active]) // (2 * n[active])
+        y = y1[active] + (2 * k * dy[active] + n[active]) // (2 * n[active])
+        visible[active] = ~walls[x, y]
+        k = k + 1
+        active = active[visible[active] & (n[active] > k)]
+
+    return visible
@@ -0,0 +1,62 @@
+# Library of the map analyzer: reading, graphs, visibility, placement and
+# rendering of the maps. Importing the package has no side effects and loads
+# nothing, each name is imported from its module the first time it is used so
+# that networkx and matplotlib are only loaded when they are needed.
+
+import importlib
+
+### MODULES ##################################################################
+
+# Modules of the package with the names they export.
+MODULES = {
+    "Parsing": ["Room", "readMap", "readAB", "exportMap", "mergeRooms", "removeRooms"],
+    "Support": ["getRoomsContainingCoord", "canJumpFromTo", "makeBidirectional", "isMultilevel",
+                "isInMapRange", "subToInd", "indToSub", "eulerianDistance", "blend", "RGBToHex",
+                "hexToRGB", "blendColor", "darkenColor", "intervalDistance", "getMaxLevel"],
+    "Visibility": ["getVisibilityMatrix", "getExactVisibility", "getSampledVisibility",
+                   "castSampledRays", "VISIBILITY_CHUNK_SIZE", "VISIBILITY_PILOT_RAYS",
+                   "getTilePairs", "getVisibilitySamples", "getVisibilityBound", "getVisibilityError",
+                   "addRoomVisibility", "pruneRoomsByVisibility", "wallDistanceFieldCache",
+                   "getWallDistanceField", "isTileVisible", "areTilesVisible"],
+    "Graphs": ["getTileGraph", "getRoomsCorridorsGraph", "getRoomsCorridorsObjectsGraph",
+               "getVisibilityGraph", "getRoomsOutlineGraph", "minMaxVisibility",
+               "getTileLevelNodes", "addStairsEdgesTiles", "addJumpEdgesTiles", "addJumpEdgesRooms",
+               "addStairsEdgesRooms"],
+    "Placement": ["PlacementSession", "Placement", "RoomGraphMetrics", "RoomQueue",
+                  "exportPlacementData", "addEverything", "addSpawnPointsSafe",
+                  "addSpawnPointsUnsafe", "addSpawnPointsUniformly", "addSpawnPointsRandom",
+                  "addResource", "getDiameterLength", "getAllPairsDistances", "getEccentricity",
+                  "getRoomsHash", "roomGraphMetricsCache", "getRoomGraphMetrics", "getDegrees",
+                  "normalizeArray", "getIntervalDistances", "getDegreeFit", "getNormalizedDegree",
+                  "getNormalizedDegreeFit", "discardNodes", "resourceDistance", "resourceRedundancy",
+                  "roomFit", "wallDistace", "objectDistance", "tileFit", "getBestTile", "getMostIsolatedNode",
+                  "getResourceIsolation", "updateResourceIsolation", "shortestPathLength"],
+    "Rendering": ["getMaxNodeLevel", "plotRoomsCorridorsGraph", "plotRoomsCorridorsObjectsGraph",
+                  "plotTilesGraph", "plotVisibilityGraph", "plotOutlinesGraph", "levelColormap",
+                  "resourceColormap", "visibilityColormap", "getNormalizedLevels",
+                  "getNodePositions", "getTileRasters", "saveRasters", "getResourceLabels",
+                  "renderTilesGraph", "renderVisibilityGraph", "renderGraph"],
+    "Instrumentation": ["logger", "instrumentation", "configureLogging"],
+}
+
+# Module of each exported name.
+MODULE_OF_NAME = {name: module for module, names in MODULES.items() for name in names}
+
+### LAZY LOADING ##############################################################
+
+# Imports the module of a name the first time it is accessed and keeps the name
+# in the package so that the following accesses do not go through here. The
+# Instrumentation class is not exported since it shares the name of its module.
+def __getattr__(name):
+    if name in MODULES:
+        return importlib.import_module("." + name, __name__)
+    if name not in MODULE_OF_NAME:
+        raise AttributeError("module " + __name__ + " has no attribute " + name)
+    value = getattr(importlib.import_module("." + MODULE_OF_NAME[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULE_OF_NAME) | set(MODULES))
+
+__all__ = sorted(MODULE_OF_NAME)
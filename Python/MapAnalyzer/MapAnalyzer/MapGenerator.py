@@ -0,0 +1,211 @@
+import os
+import random
+import argparse
+
+### PARAMETERS ###############################################################
+
+# Directions of the stairs: character and increment of the coordinates.
+STAIRS = [("W", 0, 1), ("D", 1, 0), ("S", 0, -1), ("A", -1, 0)]
+
+# Game elements which can be placed in the rooms.
+OBJECTS = ["s", "h", "a", "d"]
+
+### GENERATION FUNCTIONS ######################################################
+
+# Generates the rooms of a level until they cover the requested fraction of
+# the map. Each room is a square [x, y, size] which can overlap the others.
+def generateRooms(width, height, density, minRoomSize, maxRoomSize):
+    rooms = []
+    covered = set()
+    attempts = 0
+    maxAttempts = 100 + 10 * width * height // (minRoomSize * minRoomSize)
+
+    while (len(rooms) == 0 or len(covered) < density * width * height) and attempts < maxAttempts:
+        attempts = attempts + 1
+        size = random.randint(minRoomSize, maxRoomSize)
+        # Leave a wall on the border of the map.
+        if size > width - 2 or size > height - 2:
+            continue
+        x = random.randint(1, width - size - 1)
+        y = random.randint(1, height - size - 1)
+        rooms.append([x, y, size])
+        covered.update([(i, j) for i in range(x, x + size) for j in range(y, y + size)])
+
+    return rooms
+
+# Returns the central tile of a room.
+def getRoomCenter(room):
+    return room[0] + room[2] // 2, room[1] + room[2] // 2
+
+# Generates the corridors connecting two rooms with an horizontal and a
+# vertical segment. Corridors are [x, y, length], where a positive length
+# extends along x and a negative one along y, and are 3 tiles wide.
+def connectRooms(r1, r2):
+    x1, y1 = getRoomCenter(r1)
+    x2, y2 = getRoomCenter(r2)
+    return [[min(x1, x2) - 1, y1 - 1, abs(x2 - x1) + 3],
+            [x2 - 1, min(y1, y2) - 1, -(abs(y2 - y1) + 3)]]
+
+# Generates the corridors of a level. Each room is connected to the closest
+# of the previous ones so that the level is connected, then the additional
+# corridors connect random pairs of rooms.
+def generateCorridors(rooms, corridorCount):
+    corridors = []
+
+    for i in range(1, len(rooms)):
+        xi, yi = getRoomCenter(rooms[i])
+        closest = min(range(i), key = lambda j: abs(getRoomCenter(rooms[j])[0] - xi) +
+                      abs(getRoomCenter(rooms[j])[1] - yi))
+        corridors.extend(connectRooms(rooms[closest], rooms[i]))
+
+    if len(rooms) > 1:
+        for i in range(corridorCount):
+            r1, r2 = random.sample(rooms, 2)
+            corridors.extend(connectRooms(r1, r2))
+
+    return corridors
+
+# Draws the rooms and the corridors of a level.
+def drawLevel(width, height, rooms, corridors):
+    level = [["w" for y in range(height)] for x in range(width)]
+
+    for room in rooms:
+        for x in range(room[0], room[0] + room[2]):
+            for y in range(room[1], room[1] + room[2]):
+                level[x][y] = "r"
+
+    for corridor in corridors:
+        if corridor[2] > 0:
+            endX = corridor[0] + corridor[2] - 1
+            endY = corridor[1] + 2
+        else:
+            endX = corridor[0] + 2
+            endY = corridor[1] - corridor[2] - 1
+        for x in range(corridor[0], endX + 1):
+            for y in range(corridor[1], endY + 1):
+                level[x][y] = "r"
+
+    return level
+
+# Adds stairs from a level to the one below. A stair is an uppercase
+# character followed by a run of "O" tiles, the tile after the run must be
+# walkable in the level below. Returns the stairs genes.
+def addStairs(levels, level, stairsCount, rooms):
+    width = len(levels[level])
+    height = len(levels[level][0])
+    genes = []
+    added = 0
+    attempts = 0
+
+    while added < stairsCount and attempts < 100 * stairsCount:
+        attempts = attempts + 1
+        room = random.choice(rooms)
+        x = random.randint(room[0], room[0] + room[2] - 1)
+        y = random.randint(room[1], room[1] + room[2] - 1)
+        char, dx, dy = random.choice(STAIRS)
+        length = random.randint(1, 3)
+        run = [(x + dx * j, y + dy * j) for j in range(1, length + 1)]
+        targetX, targetY = run[-1]
+
+        if (levels[level][x][y] == "r" and targetX > 0 and targetX < width - 1 and targetY > 0 and
+            targetY < height - 1 and levels[level - 1][targetX][targetY] == "r" and
+            all([levels[level][i][j] in ["r", "w"] for i, j in run])):
+            levels[level][x][y] = char
+            genes.append([x, y, char])
+            added = added + 1
+            for i, j in run:
+                levels[level][i][j] = "O"
+                genes.append([i, j, "O"])
+
+    return genes
+
+# Adds random game elements to the rooms of a level. Returns their genes.
+def addObjects(level, objectsCount, rooms):
+    genes = []
+    attempts = 0
+
+    while len(genes) < objectsCount and attempts < 100 * objectsCount:
+        attempts = attempts + 1
+        room = random.choice(rooms)
+        x = random.randint(room[0], room[0] + room[2] - 1)
+        y = random.randint(room[1], room[1] + room[2] - 1)
+        if level[x][y] == "r":
+            level[x][y] = random.choice(OBJECTS)
+            genes.append([x, y, level[x][y]])
+
+    return genes
+
+# Generates a map with the specified number of levels. Returns the levels and
+# the AB genome of each level.
+def generateMap(width, height, levelCount = 1, density = 0.3, corridorCount = 5, stairsCount = 2,
+                objectsCount = 10, minRoomSize = 3, maxRoomSize = 10):
+    levels = []
+    genomes = []
+
+    for i in range(levelCount):
+        rooms = generateRooms(width, height, density, minRoomSize, maxRoomSize)
+        corridors = generateCorridors(rooms, corridorCount)
+        levels.append(drawLevel(width, height, rooms, corridors))
+        elements = []
+        if i > 0:
+            elements.extend(addStairs(levels, i, stairsCount, rooms))
+        elements.extend(addObjects(levels[i], objectsCount, rooms))
+        genomes.append([rooms, corridors, elements])
+
+    return levels, genomes
+
+### INPUT/OUTPUT FUNCTIONS ####################################################
+
+# Converts a list of genes to a string.
+def genesToString(genes):
+    return "".join(["<" + ",".join([str(value) for value in gene]) + ">" for gene in genes])
+
+# Exports the levels in the format expected by readMap.
+def exportMap(levels, filePath):
+    with open(filePath, "w") as f:
+        f.write("\n\n".join(["\n".join(["".join(row) for row in level]) for level in levels]))
+
+# Exports the genomes in the format expected by readAB.
+def exportAB(genomes, filePath):
+    with open(filePath, "w") as f:
+        f.write("||".join([genesToString(rooms) + "|" + genesToString(corridors) +
+                           ("|" + genesToString(elements) if len(elements) > 0 else "")
+                           for rooms, corridors, elements in genomes]))
+
+### MAIN ######################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Generates synthetic MAPNAME.map.txt and "
+                                     "MAPNAME.AB.txt files.")
+    parser.add_argument("name", help = "MAPNAME of the generated files")
+    parser.add_argument("--width", type = int, default = 100, help = "number of rows")
+    parser.add_argument("--height", type = int, default = 100, help = "number of columns")
+    parser.add_argument("--levels", type = int, default = 1, help = "number of levels")
+    parser.add_argument("--density", type = float, default = 0.3,
+                        help = "fraction of each level covered by rooms")
+    parser.add_argument("--corridors", type = int, default = 5,
+                        help = "corridors added to each level beside the ones connecting the rooms")
+    parser.add_argument("--stairs", type = int, default = 2,
+                        help = "stairs from each level to the one below")
+    parser.add_argument("--objects", type = int, default = 10, help = "game elements in each level")
+    parser.add_argument("--min-room", type = int, default = 3, help = "minimum room size")
+    parser.add_argument("--max-room", type = int, default = 10, help = "maximum room size")
+    parser.add_argument("--seed", type = int, default = None, help = "random seed")
+    parser.add_argument("--output", default = "./Input", help = "output folder")
+    args = parser.parse_args()
+
+    if args.min_room < 3 or args.max_room < args.min_room:
+        parser.error("rooms must be at least 3 tiles wide and --max-room must not be less than --min-room")
+
+    random.seed(args.seed)
+
+    if not os.path.exists(args.output):
+        os.makedirs(args.output)
+
+    levels, genomes = generateMap(args.width, args.height, args.levels, args.density, args.corridors,
+                                  args.stairs, args.objects, args.min_room, args.max_room)
+    exportMap(levels, args.output + "/" + args.name + ".map.txt")
+    exportAB(genomes, args.output + "/" + args.name + ".AB.txt")
+
+    print("Generated " + args.name + " with " + str(sum([len(g[0]) for g in genomes])) + " rooms and " +
+          str(sum([len(g[1]) for g in genomes])) + " corridors.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The MapAnalysis package is imported from the folder of the analyzer.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
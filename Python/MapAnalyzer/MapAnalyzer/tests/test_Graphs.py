@@ -0,0 +1,26 @@
+import os
+import sys
+import shutil
+import subprocess
+
+### PARAMETERS ###############################################################
+
+analyzerDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+### TESTS ####################################################################
+
+# Renders the graphs of a single-level map in headless mode.
+def testRenderSingleLevel(tmp_path):
+    os.makedirs(str(tmp_path / "Input"))
+    for fileName in ["arena.map.txt", "arena.ab.txt"]:
+        shutil.copy(os.path.join(analyzerDir, "Input", fileName), str(tmp_path / "Input"))
+
+    env = dict(os.environ, MPLBACKEND = "Agg")
+    result = subprocess.run([sys.executable, os.path.join(analyzerDir, "MapAnalyzer.py"), "--quiet",
+                             "--map", "arena", "--render", "rooms,objects,outlines"],
+                            cwd = str(tmp_path), env = env, stdout = subprocess.PIPE,
+                            stderr = subprocess.PIPE, universal_newlines = True)
+
+    assert result.returncode == 0, result.stderr
+    for graphName in ["rooms", "objects", "outlines"]:
+        assert os.path.getsize(str(tmp_path / "Output" / ("arena_" + graphName + ".png"))) > 0
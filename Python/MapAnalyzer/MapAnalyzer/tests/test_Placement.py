@@ -0,0 +1,83 @@
+import os
+import pytest
+import networkx as nx
+from MapAnalysis.Parsing import readMap, readAB, mergeRooms, removeRooms
+from MapAnalysis.Placement import PlacementSession, RoomQueue, getBestTile, getNormalizedDegreeFit, \
+    getMostIsolatedNode, getResourceIsolation, updateResourceIsolation
+
+### PARAMETERS ###############################################################
+
+inputDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Input")
+
+# Single-level maps the strategies are checked on.
+MAPS = ["arena", "corridors", "intense"]
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Starts a placement session on a map of the input folder.
+def getSession(mapName):
+    rooms = readAB(inputDir + "/" + mapName + ".ab.txt")
+    mergeRooms(rooms)
+    return PlacementSession(readMap(inputDir + "/" + mapName + ".map.txt"), removeRooms(rooms))
+
+# Places the objects with the room queue, checking that each tile is the one
+# found scoring all the rooms.
+def placeWithQueue(session, placement, object, objects, degreeFit, visibilityFit, roomWeigths, 
+                   tileWeigths):
+    roomGraph = placement.roomGraph
+    diameter = session.getMetrics().diameter
+    roomQueue = RoomQueue(roomGraph, diameter, degreeFit, object, objects, roomWeigths)
+
+    for i in range(object[1]):
+        bestTile = getBestTile(roomGraph, diameter, session.diagonal, object, objects, 
+                               placement.placedObjects, degreeFit, visibilityFit, roomWeigths, 
+                               tileWeigths, roomQueue)
+        assert bestTile == getBestTile(roomGraph, diameter, session.diagonal, object, objects, 
+                                       placement.placedObjects, degreeFit, visibilityFit, roomWeigths, 
+                                       tileWeigths)
+        roomQueue.update(placement.addResource(bestTile[0], bestTile[1], object[0]))
+
+# Returns the node which has the maximum minimum distance from the resource 
+# nodes, searching the path from each node to each resource node.
+def getMostIsolatedNodeByPairs(graph, resource):
+    nodes = [(node1, min([nx.shortest_path_length(graph, node1, node2) 
+             for node2, data2 in graph.nodes(data = True) if ("resource" in data2 and 
+             data2["resource"] == resource)]))
+             for node1, data1 in graph.nodes(data = True) if ("resource" not in data1)]
+    return graph.nodes[max(nodes, key = lambda x: x[1])[0]]
+
+### TESTS ####################################################################
+
+# Checks the room queue against the scoring of all the rooms, for the spawn
+# points and then for the medkits, whose queue starts with resources placed.
+@pytest.mark.parametrize("mapName", MAPS)
+def testRoomQueue(mapName):
+    session = getSession(mapName)
+    placement = session.newPlacement()
+    normalizedDegree = session.getMetrics().normalizedDegree
+    visibilityMatrix = session.getVisibilityMatrix()
+
+    placeWithQueue(session, placement, ["s", 5], ["s"], 
+                   getNormalizedDegreeFit(normalizedDegree, 0.1, 0.3),
+                   [[1 - visibility for visibility in row] for row in visibilityMatrix], 
+                   [1, 0.25, -2], [1, 0.5, 0.5])
+    placeWithQueue(session, placement, ["h", 4], ["s", "h"], 
+                   getNormalizedDegreeFit(normalizedDegree, 0.3, 0.5), visibilityMatrix, 
+                   [1, 0.25, 0], [1, 0.25, 0.5])
+
+# Places spawn points in the most isolated rooms, checking that the isolation
+# updated after each one finds the room found searching all the paths.
+@pytest.mark.parametrize("mapName", MAPS)
+def testResourceIsolation(mapName):
+    placement = getSession(mapName).newPlacement()
+    roomGraph = placement.roomGraph
+    room = roomGraph.nodes[next(iter(roomGraph.nodes))]
+    node = placement.addResource(room["originX"], room["originY"], "s")
+    isolation = getResourceIsolation(roomGraph, "s")
+
+    for i in range(5):
+        room = getMostIsolatedNode(roomGraph, "s", isolation)
+        assert room == getMostIsolatedNodeByPairs(roomGraph, "s")
+        node = placement.addResource(room["originX"], room["originY"], "s")
+        updateResourceIsolation(roomGraph, isolation, node)
+        assert isolation == getResourceIsolation(roomGraph, "s")
@@ -0,0 +1,32 @@
+import os
+from MapAnalysis.Parsing import readMap
+from MapAnalysis.Instrumentation import instrumentation
+from MapAnalysis.Visibility import getVisibilityMatrix
+
+### PARAMETERS ###############################################################
+
+inputDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Input")
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Returns the maximum absolute difference of the normalized visibility of the
+# walkable tiles of two matrices.
+def getMaxDifference(map, visibility, expected):
+    return max([abs(visibility[x][y] - expected[x][y]) for x in range(len(map)) 
+                for y in range(len(map[0])) if not map[x][y] == "w"])
+
+### TESTS ####################################################################
+
+# Checks that the sampled visibility of the arena is within the error from the
+# exact one, with fewer rays than the pairs of tiles, and that it falls back
+# to the exact one when the sample would cost as much.
+def testSampledVisibility():
+    map = readMap(inputDir + "/arena.map.txt")
+    count = sum([tile != "w" for row in map for tile in row])
+    exact = getVisibilityMatrix(map)
+
+    instrumentation.reset()
+    assert getMaxDifference(map, getVisibilityMatrix(map, 0.5), exact) <= 0.5
+    assert instrumentation.counters["raysCast"] < count * (count - 1) / 2
+
+    assert getMaxDifference(map, getVisibilityMatrix(map, 0.3), exact) == 0
@@ -0,0 +1,414 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# The large logs are decoded as a stream if ijson is installed.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+### PARAMETERS ###############################################################
+
+# Columns of each kind of log with their types. The finalStatistics object of
+# the statistics logs is stored as a log with a single entry.
+LOG_COLUMNS = {
+    "spawnLogs": [("timestamp", np.float64), ("x", np.float64), ("y", np.float64),
+                  ("spawnedEntity", str)],
+    "positionLogs": [("timestamp", np.float64), ("x", np.float64), ("y", np.float64),
+                     ("direction", np.float64)],
+    "shotLogs": [("timestamp", np.float64), ("x", np.float64), ("y", np.float64),
+                 ("direction", np.float64), ("weapon", np.int32), ("ammoInCharger", np.int32),
+                 ("totalAmmo", np.int32)],
+    "reloadLogs": [("timestamp", np.float64), ("weapon", np.int32), ("ammoInCharger", np.int32),
+                   ("totalAmmo", np.int32)],
+    "hitLogs": [("timestamp", np.float64), ("x", np.float64), ("y", np.float64),
+                ("hittedEntity", str), ("hitterEntity", str), ("damage", np.int32)],
+    "killLogs": [("timestamp", np.float64), ("x", np.float64), ("y", np.float64),
+                 ("killedEntity", str), ("killerEntity", str)],
+    "targetStatisticsLogs": [("timestamp", np.float64), ("playerInitialX", np.float64),
+                             ("playerInitialY", np.float64), ("playerX", np.float64),
+                             ("playerY", np.float64), ("targetX", np.float64), ("targetY", np.float64),
+                             ("coveredTileDistance", np.float64), ("time", np.float64),
+                             ("speed", np.float64)],
+    "finalStatistics": [("totalShots", np.int32), ("totalHits", np.int32), ("accuracy", np.float64),
+                        ("coveredDistance", np.float64), ("mediumKillTime", np.float64),
+                        ("mediumKillDistance", np.float64)],
+}
+
+# Fields of the header of the logs with their path in the JSON.
+HEADER_FIELDS = {"testID": "testID", "logPart": "logPart", "experiment": "gameInfo.experiment",
+                 "scene": "gameInfo.scene", "duration": "gameInfo.duration", "width": "mapInfo.width",
+                 "height": "mapInfo.height", "tileSize": "mapInfo.tileSize", "flip": "mapInfo.flip"}
+
+# Minimum size in bytes of the logs decoded as a stream. Smaller logs are
+# decoded faster as a whole and their memory is negligible.
+STREAMING_MIN_SIZE = 16 << 20
+
+# Columns identifying the session of each entry, in every table.
+KEY_COLUMNS = [("testID", str), ("map", str), ("placement", str), ("logPart", np.int32)]
+
+# Columns identifying the session and the log file of each entry, in every
+# table. Different files may share the key of the session.
+SOURCE_COLUMNS = KEY_COLUMNS + [("fileName", str)]
+
+# Columns of the table with one row for each log file.
+SESSION_COLUMNS = SOURCE_COLUMNS + [("log", str), ("variant", str), ("experiment", str), ("scene", str),
+                                 ("duration", np.float64), ("width", np.float64),
+                                 ("height", np.float64), ("tileSize", np.float64), ("flip", np.bool_)]
+
+# Name of the log files: TESTID_MAP_PLACEMENT_LOG[_VARIANT][_PART].json, where
+# LOG is game or statistics, VARIANT is incomplete, generated or both and PART
+# is the number of the part of the logs that have not been merged.
+LOG_FILE_NAME = re.compile(r"^(\d+)_([A-Za-z0-9]+)_([A-Za-z0-9]+)_(game|statistics)((?:_[a-z]+)*)(?:_\d+)?\.json$")
+
+# Columns identifying a session, whose parts are merged.
+SESSION_KEY_COLUMNS = KEY_COLUMNS[:3]
+
+# Columns of the table with one row for each merged session.
+MERGED_SESSION_COLUMNS = SESSION_KEY_COLUMNS + [("experiment", str), ("scene", str),
+                                                ("duration", np.float64), ("width", np.float64),
+                                                ("height", np.float64), ("tileSize", np.float64),
+                                                ("flip", np.bool_), ("parts", np.int32),
+                                                ("complete", np.bool_), ("hasStatistics", np.bool_),
+                                                ("generated", np.bool_)]
+
+# Name of the file of the store listing the ingested log files.
+MANIFEST_FILE_NAME = "manifest.json"
+
+### PARSING FUNCTIONS #########################################################
+
+# Returns the test ID, map, placement, log and variant encoded in the name of
+# a log file, or None if the file is not a game or statistics log.
+def parseLogFileName(fileName):
+    match = LOG_FILE_NAME.match(fileName)
+    if match is None:
+        return None
+    testID, map, placement, log, variant = match.groups()
+    return testID, map, placement, log, variant[1:]
+
+# Converts a list of values to a column of the given type.
+def toColumn(values, type):
+    if type is str:
+        return np.array(values, dtype = str) if len(values) > 0 else np.empty(0, dtype = "U1")
+    return np.array(values, dtype = type)
+
+# Converts the values of the columns of a log to a table, adding the key of
+# the session and the name of the log file to each entry.
+def toTable(values, columns, key, fileName):
+    count = len(values[columns[0][0]])
+    table = {}
+    for (name, type), value in zip(SOURCE_COLUMNS, list(key) + [fileName]):
+        table[name] = np.full(count, value, dtype = type if type is not str else None)
+    for name, type in columns:
+        table[name] = toColumn(values[name], type)
+    return table
+
+# Decodes a log file as a stream, appending each value straight to the list
+# of its column. Returns the fields of the header and the values of the
+# columns of each kind of log in the file.
+def streamLogFile(filePath):
+    paths = {path: name for name, path in HEADER_FIELDS.items()}
+    header = {}
+    logs = {}
+
+    with open(filePath, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float = True):
+            if (event == "start_array" and prefix in LOG_COLUMNS) or \
+               (event == "start_map" and prefix == "finalStatistics"):
+                logs[prefix] = {name: [] for name, _ in LOG_COLUMNS[prefix]}
+            elif event in ("number", "string", "boolean", "null"):
+                if prefix in paths:
+                    header[paths[prefix]] = value
+                else:
+                    kind, _, name = prefix.rpartition(".")
+                    if kind.endswith(".item"):
+                        kind = kind[:-len(".item")]
+                    if kind in logs and name in logs[kind]:
+                        logs[kind][name].append(value)
+
+    return header, logs
+
+# Decodes a whole log file. Returns the same data as streamLogFile.
+def decodeLogFile(filePath):
+    with open(filePath) as f:
+        content = json.load(f)
+
+    header = {}
+    for name, path in HEADER_FIELDS.items():
+        value = content
+        for field in path.split("."):
+            value = value[field]
+        header[name] = value
+
+    logs = {}
+    for kind, columns in LOG_COLUMNS.items():
+        if kind in content:
+            entries = content[kind] if isinstance(content[kind], list) else [content[kind]]
+            logs[kind] = {name: [entry[name] for entry in entries] for name, _ in columns}
+
+    return header, logs
+
+# Parses a log file. Returns the row of the session table and a table for each
+# kind of log it contains.
+def parseLogFile(filePath):
+    fileName = os.path.basename(filePath)
+    testID, map, placement, log, variant = parseLogFileName(fileName)
+    if ijson is not None and os.path.getsize(filePath) >= STREAMING_MIN_SIZE:
+        header, logs = streamLogFile(filePath)
+    else:
+        header, logs = decodeLogFile(filePath)
+
+    key = (header["testID"], map, placement, header["logPart"])
+    session = dict(zip([name for name, _ in KEY_COLUMNS], key))
+    session.update(header)
+    session.update({"fileName": fileName, "log": log, "variant": variant})
+
+    tables = {kind: toTable(values, LOG_COLUMNS[kind], key, fileName) for kind, values in logs.items()}
+
+    return session, tables
+
+# Parses log files in parallel with a pool of worker processes, or in this
+# process if workers is 1. Yields the results of parseLogFile in order.
+def parseLogFiles(filePaths, workers = None):
+    if workers == 1 or len(filePaths) < 2:
+        yield from map(parseLogFile, filePaths)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            yield from executor.map(parseLogFile, filePaths, chunksize = 4)
+
+### STORE FUNCTIONS ###########################################################
+
+# Concatenates tables with the same columns.
+def concatenateTables(tables, columns):
+    return {name: (np.concatenate([table[name] for table in tables]) if len(tables) > 0 else
+                   toColumn([], type)) for name, type in columns}
+
+# Saves a table as a .npz file, or as a Parquet file if the extension of the
+# path is .parquet, which requires pandas and pyarrow.
+def saveTable(table, filePath):
+    if filePath.endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(table).to_parquet(filePath, index = False)
+    else:
+        np.savez_compressed(filePath, **table)
+
+# Loads a table saved by saveTable.
+def loadTable(filePath):
+    if filePath.endswith(".parquet"):
+        import pandas as pd
+        df = pd.read_parquet(filePath)
+        return {name: df[name].to_numpy() for name in df.columns}
+    with np.load(filePath) as f:
+        return {name: f[name] for name in f.files}
+
+# Returns the path of the file of a table in the store.
+def getTablePath(storeDir, name, format = "npz"):
+    return storeDir + "/" + name + "." + format
+
+# Returns a table without the rows of a log file. The rows are matched by the
+# name of the file, since the game and the statistics logs of a session, and
+# their variants, share the key.
+def removeFile(table, fileName):
+    mask = table["fileName"] == fileName
+    return {name: column[~mask] for name, column in table.items()}
+
+# Returns the empty tables of the store.
+def getEmptyStore():
+    store = {"sessions": concatenateTables([], SESSION_COLUMNS)}
+    for kind, columns in LOG_COLUMNS.items():
+        store[kind] = concatenateTables([], SOURCE_COLUMNS + columns)
+    return store
+
+# Saves the tables of the store.
+def saveStore(store, storeDir, format = "npz"):
+    if not os.path.exists(storeDir):
+        os.makedirs(storeDir)
+    for name, table in store.items():
+        saveTable(table, getTablePath(storeDir, name, format))
+
+# Loads the tables of the store, indexed by their name.
+def loadStore(storeDir, format = "npz"):
+    return {name: loadTable(getTablePath(storeDir, name, format))
+            for name in ["sessions"] + list(LOG_COLUMNS)}
+
+### REASSEMBLY FUNCTIONS ######################################################
+
+# Returns the key of the session of each row of a table as a single string.
+def getSessionKeys(table):
+    keys = table[SESSION_KEY_COLUMNS[0][0]]
+    for name, _ in SESSION_KEY_COLUMNS[1:]:
+        keys = np.char.add(np.char.add(keys, "_"), table[name])
+    return keys
+
+# Merges the parts of each session, as the experiment control does when it
+# downloads the logs. The entries of the parts are sorted by timestamp and the
+# final statistics are the ones of the last part. The logs of a session are
+# complete if they have the part 0 and all the following ones up to the last,
+# the logs merged by the experiment control are incomplete if their part is
+# -1. Returns the tables of the store with a row for each session in the
+# sessions table and without the logPart and the fileName columns.
+def reassembleSessions(store):
+    files = store["sessions"]
+    keys = getSessionKeys(files)
+    sessionKeys, first, index = np.unique(keys, return_index = True, return_inverse = True)
+    count = len(sessionKeys)
+
+    def countParts(mask):
+        return np.bincount(index[mask], minlength = count)
+
+    game = files["log"] == "game"
+    lastPart = np.zeros(count, dtype = np.int32)
+    np.maximum.at(lastPart, index[game], files["logPart"][game])
+    complete = (countParts(game & (files["logPart"] == 0)) > 0) & \
+               (countParts(game & (files["logPart"] == -1)) == 0) & \
+               (countParts(game & (files["logPart"] > 0)) == lastPart)
+    generated = np.char.find(files["variant"], "generated") >= 0
+
+    sessions = {name: files[name][first] for name, _ in MERGED_SESSION_COLUMNS if name in files}
+    sessions.update({"parts": countParts(game).astype(np.int32), "complete": complete,
+                     "hasStatistics": countParts(~game) > 0,
+                     "generated": countParts(~game & generated) > 0})
+    merged = {"sessions": sessions}
+
+    for kind in LOG_COLUMNS:
+        table = store[kind]
+        keys = getSessionKeys(table)
+        if kind == "finalStatistics":
+            order = np.lexsort((table["logPart"], keys))
+            # Keep the last part of each session.
+            order = order[np.append(keys[order][1:] != keys[order][:-1], True)] if len(order) > 0 \
+                else order
+        else:
+            order = np.lexsort((table["timestamp"], keys))
+        merged[kind] = {name: column[order] for name, column in table.items()
+                        if name != "logPart" and name != "fileName"}
+
+    return merged
+
+# Loads the tables of the store with the parts of each session merged.
+def loadSessions(storeDir, format = "npz"):
+    return reassembleSessions(loadStore(storeDir, format))
+
+### MANIFEST FUNCTIONS ########################################################
+
+# Computes the hash of the content of a file.
+def getFileHash(filePath):
+    hash = hashlib.md5()
+    with open(filePath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hash.update(block)
+    return hash.hexdigest()
+
+# Loads the manifest of a store, which maps the name of each ingested file to
+# its size, modification time, hash and kinds of logs.
+def loadManifest(storeDir):
+    filePath = storeDir + "/" + MANIFEST_FILE_NAME
+    if not os.path.isfile(filePath):
+        return {}
+    with open(filePath) as f:
+        return json.load(f)
+
+# Saves the manifest of a store.
+def saveManifest(manifest, storeDir):
+    with open(storeDir + "/" + MANIFEST_FILE_NAME, "w") as f:
+        json.dump(manifest, f, indent = 2, sort_keys = True)
+
+# Tells if all the tables of a store exist in the given format.
+def isStoreComplete(storeDir, format = "npz"):
+    return all([os.path.isfile(getTablePath(storeDir, name, format))
+                for name in ["sessions"] + list(LOG_COLUMNS)])
+
+### INGESTION FUNCTIONS #######################################################
+
+# Parses the new and changed log files in a folder and adds them to the tables
+# of the store, removing the rows of the changed and deleted files. Files with
+# the size and modification time in the manifest are skipped without reading
+# them, files whose hash is unchanged are only touched in the manifest. If
+# rebuild is True the store is rebuilt from scratch. The files are parsed by
+# the given number of worker processes, all the cores if None. Returns the
+# number of parsed, skipped and removed files.
+def ingestLogs(inputDir, storeDir, format = "npz", rebuild = False, workers = None):
+    manifest = loadManifest(storeDir)
+    if rebuild or not isStoreComplete(storeDir, format):
+        manifest = {}
+    store = loadStore(storeDir, format) if len(manifest) > 0 else getEmptyStore()
+    # The stores without the name of the files cannot remove their rows.
+    if "fileName" not in store["sessions"]:
+        manifest = {}
+        store = getEmptyStore()
+
+    fileNames = sorted([f for f in os.listdir(inputDir) if parseLogFileName(f) is not None])
+    parsed = []
+    skipped = 0
+
+    for fileName in fileNames:
+        stat = os.stat(inputDir + "/" + fileName)
+        entry = manifest.get(fileName)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            skipped = skipped + 1
+            continue
+        hash = getFileHash(inputDir + "/" + fileName)
+        if entry is not None and entry["hash"] == hash:
+            entry.update({"size": stat.st_size, "mtime": stat.st_mtime})
+            skipped = skipped + 1
+            continue
+        parsed.append((fileName, stat, hash))
+
+    # Remove the rows of the changed and deleted files.
+    deleted = [f for f in manifest if f not in fileNames]
+    stale = deleted + [f for f, _, _ in parsed if f in manifest]
+    for fileName in stale:
+        entry = manifest.pop(fileName)
+        store["sessions"] = removeFile(store["sessions"], fileName)
+        for kind in entry["kinds"]:
+            store[kind] = removeFile(store[kind], fileName)
+
+    sessions = [store["sessions"]]
+    tables = {kind: [store[kind]] for kind in LOG_COLUMNS}
+
+    results = parseLogFiles([inputDir + "/" + fileName for fileName, _, _ in parsed], workers)
+    for (fileName, stat, hash), (session, fileTables) in zip(parsed, results):
+        sessions.append({name: toColumn([session[name]], type) for name, type in SESSION_COLUMNS})
+        for kind, table in fileTables.items():
+            tables[kind].append(table)
+        manifest[fileName] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": hash,
+                              "kinds": list(fileTables)}
+
+    if len(parsed) > 0 or len(stale) > 0:
+        store["sessions"] = concatenateTables(sessions, SESSION_COLUMNS)
+        for kind, columns in LOG_COLUMNS.items():
+            store[kind] = concatenateTables(tables[kind], SOURCE_COLUMNS + columns)
+        saveStore(store, storeDir, format)
+    saveManifest(manifest, storeDir)
+
+    return len(parsed), skipped, len(deleted)
+
+### MAIN ######################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Converts the game and statistics logs into a "
+                                     "columnar table for each kind of log.")
+    parser.add_argument("--input", default = "../../../Results/Data", help = "folder of the logs")
+    parser.add_argument("--store", default = "./Input/Store", help = "folder of the tables")
+    parser.add_argument("--format", default = "npz", choices = ["npz", "parquet"],
+                        help = "file format of the tables, parquet requires pyarrow")
+    parser.add_argument("--rebuild", action = "store_true",
+                        help = "parse all the logs again instead of only the new and changed ones")
+    parser.add_argument("--workers", type = int, default = None,
+                        help = "number of processes parsing the logs, all the cores by default")
+    args = parser.parse_args()
+
+    print("Ingesting the logs...")
+    parsed, skipped, removed = ingestLogs(args.input, args.store, args.format, args.rebuild,
+                                          args.workers)
+    print("Done. Parsed " + str(parsed) + " log files, skipped " + str(skipped) + " unchanged ones "
+          "and removed " + str(removed) + " deleted ones.")
+
+    sessions = loadSessions(args.store, args.format)["sessions"]
+    print("The store has " + str(len(sessions["testID"])) + " sessions, " +
+          str(np.count_nonzero(sessions["complete"])) + " of which are complete.")
@@ -1,5 +1,7 @@
 import os
-import csv
+import sys
+import shutil
+import argparse
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -10,12 +12,23 @@ from scipy.stats import wilcoxon, binom_test, norm
 from scipy.ndimage.filters import gaussian_filter
 from matplotlib.font_manager import FontProperties
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from SessionMetrics import DATA_COLUMNS, DATA_TYPES
 
 ### FUNCTIONS ###############################################################
 
-# Gets the file name and parses its data.
+# Data returned by getData, the only frame whose extracted columns are cached,
+# and its columns by column and conversion.
+cachedData = None
+arrayCache = {}
+
+# Gets the file name and parses its data. The columns extracted from the 
+# previous data are discarded.
 def getData(inputDir):
+    global cachedData
     inputAcquired = False
+    cachedData = None
+    arrayCache.clear()
 
     # fileName = input("\nInsert the file name: ")
     fileName = "data.csv"
@@ -26,46 +39,50 @@ def getData(inputDir):
             print("File found.")
             inputAcquired = True
             # Parse the data.
-            with open(inputDir + "/" + fileName) as csvfile:
-                reader = csv.reader(csvfile, delimiter = ';', quotechar = '|')
-                data = list(reader)
+            data = pd.read_csv(inputDir + "/" + fileName, sep = ';', header = None, 
+                               names = DATA_COLUMNS, dtype = DATA_TYPES)
         else:
             fileName = input("File not found. Insert the file name: ")
+    cachedData = data
     return data
 
-# Extracts a column from the data.
+# Extracts a column from the data, given by name or index, without the 
+# missing values. The arrays are read-only, and cached only for the data 
+# returned by getData, since the other frames are read once.
 def getArrayFromData(data, column, conversion=0):
-    array = list()
-
-    for i in range(len(data)):
-        if (data[i][column] != ""):
-            if (conversion == 1):
-                try:
-                    array.append(int(float(data[i][column])))
-                except:
-                    pass
-            elif (conversion == 2):
-                try:
-                    array.append(float(data[i][column]))
-                except:
-                    pass
-            else:
-                array.append(data[i][column])
-
+    if isinstance(column, int):
+        column = data.columns[column]
+
+    if data is not cachedData:
+        return extractArray(data, column, conversion)
+    if (column, conversion) not in arrayCache:
+        arrayCache[(column, conversion)] = extractArray(data, column, conversion)
+
+    return arrayCache[(column, conversion)]
+
+# Extracts a column from the data without the missing values, converting it 
+# to integers (1) or to floats (2) if requested, as a read-only array.
+def extractArray(data, column, conversion):
+    values = data[column].dropna()
+    if (conversion == 1):
+        values = pd.to_numeric(values, errors = "coerce").dropna().astype(int)
+    elif (conversion == 2):
+        values = pd.to_numeric(values, errors = "coerce").dropna().astype(float)
+    array = values.to_numpy()
+    array.setflags(write = False)
     return array
 
-# Counts occurencies in array.
-def getCountInData(data, column, map, min, max):
-    totalCount = list()
-
-    for i in range(min, max):
-        count = 0
-        for j in range(len(data)):
-            if data[j][1] == map and int(float(data[j][column])) == i:
-                count = count + 1
-        totalCount.append(count)            
-
-    return totalCount
+# Counts the occurrences of each integer value from min to max - 1 of a column
+# in each map with a single bincount. Returns a table with a row for each map
+# and a column for each value.
+def getCountsByMap(data, column, min, max):
+    values = data[column].dropna().astype(int)
+    maps, mapIndex = np.unique(data.loc[values.index, "Map"].to_numpy(), return_inverse = True)
+    values = values.to_numpy()
+    inRange = (values >= min) & (values < max)
+    counts = np.bincount(mapIndex[inRange] * (max - min) + values[inRange] - min, 
+                         minlength = len(maps) * (max - min))
+    return pd.DataFrame(counts.reshape(len(maps), max - min), index = maps, columns = range(min, max))
 
 # Compares the outcomes.
 def compareOutcomes(real, perceived, outcome):
@@ -85,9 +102,11 @@ def compareOutcomes(real, perceived, outcome):
 # Generate the bar diagram of the kills.
 def generateBarDiagramKills(data, safe):
     # Extract the data.
-    killsSafeArena = getCountInData(data, 6 if safe else 13, "arena", 3, 17)
-    killsSafeCorridors = getCountInData(data, 6 if safe else 13, "corridors", 3, 17)
-    killsSafeIntense = getCountInData(data, 6 if safe else 13, "intense", 3, 17)
+    counts = getCountsByMap(data, "Kills (heuristic)" if safe else "Kills (uniform)", 3, 17)
+    counts = counts.reindex(["arena", "corridors", "intense"], fill_value = 0)
+    killsSafeArena = counts.loc["arena"].tolist()
+    killsSafeCorridors = counts.loc["corridors"].tolist()
+    killsSafeIntense = counts.loc["intense"].tolist()
     N = len(killsSafeArena)
 
     # Setup the graph.
@@ -120,8 +139,8 @@ def generateBarDiagramKills(data, safe):
 # Generate the bar diagram of the difficulty.
 def generateBarDiagramDifficulty(data):
     # Extract the data.
-    realDifficulty = getArrayFromData(data, 16)
-    perceivedDifficulty = getArrayFromData(data, 17)
+    realDifficulty = getArrayFromData(data, "Difficulty (real)")
+    perceivedDifficulty = getArrayFromData(data, "Difficulty (perceived)")
     
     safe = compareOutcomes(realDifficulty, perceivedDifficulty, "safe")
     equal = compareOutcomes(realDifficulty, perceivedDifficulty, "equal")
@@ -164,15 +183,12 @@ def generateBarDiagramDifficulty(data):
     # plt.show()
     plt.clf()
 
-# Counts the occurencies.
-def countOccurencies(array1, array2, i):
-    count = 0
-
-    for j in range(len(array1)):
-        if array1[i] == array1[j] and array2[i] == array2[j]:
-            count = count + 1 
-
-    return count
+# Counts the occurencies of the pair of values of each element of two arrays
+# with a single pass of np.unique over the pairs.
+def countOccurencies(array1, array2):
+    pairs = np.column_stack((array1, array2))
+    _, inverse, counts = np.unique(pairs, axis = 0, return_inverse = True, return_counts = True)
+    return counts[inverse.ravel()]
 
 # Generate scatter diagram.
 def generateScatterDiagram(data, column1, column2, showTicks, xlabel, ylabel, title):
@@ -183,7 +199,7 @@ def generateScatterDiagram(data, column1, column2, showTicks, xlabel, ylabel, ti
     maxData = maxData + maxData * 0.025
     mean1 = np.mean(data1)
     mean2 = np.mean(data2)
-    area = [(np.pi * (30 * countOccurencies(data1, data2, i))) for i in range(len(data1))]
+    area = np.pi * (30 * countOccurencies(data1, data2))
 
     # Plot.
     fig, ax = plt.subplots()
@@ -203,74 +219,49 @@ def generateScatterDiagram(data, column1, column2, showTicks, xlabel, ylabel, ti
     # plt.show()
     plt.clf()
 
-# Generate scatter diagram of kills.
-def generateScatterKills():
+# Datasets with a header read by the diagrams, by file path, with the
+# modification time of the file when they were read.
+datasetCache = {}
+
+# Reads a dataset with a header from the input folder. The same frame is 
+# returned until the file is modified.
+def getDataset(fileName):
+    filePath = inputDir + "/" + fileName
+    modificationTime = os.stat(filePath).st_mtime_ns
+    if filePath not in datasetCache or datasetCache[filePath][0] != modificationTime:
+        datasetCache[filePath] = (modificationTime, pd.read_csv(filePath, sep = ";", index_col = 0))
+    return datasetCache[filePath][1]
+
+# Generate scatter diagram of a metric of the heuristic and of the uniform
+# placement, with the histogram of each one.
+def generateScatterMetric(metric, limits, tick, title):
     # Extract the data.
-    df = pd.read_csv(inputDir + "/datasb.csv", sep = ";", index_col=0)    
-    g = sns.JointGrid(x="Kills (heuristic)", y="Kills (uniform)", data=df, xlim = [0, 20], ylim = [0, 20])
+    df = getDataset("datasb.csv")
+    g = sns.JointGrid(x=metric + " (heuristic)", y=metric + " (uniform)", data=df, xlim = limits, 
+                      ylim = limits)
     g = g.plot_joint(plt.scatter, color = "m",  alpha=.6)
-    _ = g.ax_marg_x.hist(df["Kills (heuristic)"], color = "b", alpha=.6)
-    _ = g.ax_marg_y.hist(df["Kills (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
-    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(2))
-    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(2))
-    plt.savefig(exportDir + "/scatter_kills", dpi = 200, bbox_inches = "tight")
+    _ = g.ax_marg_x.hist(df[metric + " (heuristic)"], color = "b", alpha=.6)
+    _ = g.ax_marg_y.hist(df[metric + " (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
+    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(tick))
+    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(tick))
+    plt.savefig(exportDir + "/" + title, dpi = 200, bbox_inches = "tight")
     plt.clf()
 
+# Generate scatter diagram of kills.
+def generateScatterKills():
+    generateScatterMetric("Kills", [0, 20], 2, "scatter_kills")
+
 # Generate scatter diagram of distance.
 def generateScatterDistance():
-    # Extract the data.
-    df = pd.read_csv(inputDir + "/datasb.csv", sep = ";", index_col=0)    
-    g = sns.JointGrid(x="Distance (heuristic)", y="Distance (uniform)", data=df, xlim = [400, 800],
-                      ylim = [400, 800])
-    g = g.plot_joint(plt.scatter, color = "m",  alpha=.6)
-    _ = g.ax_marg_x.hist(df["Distance (heuristic)"], color = "b", alpha=.6)
-    _ = g.ax_marg_y.hist(df["Distance (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
-    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(100))
-    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(100))
-    plt.savefig(exportDir + "/scatter_distance", dpi = 200, bbox_inches = "tight")
-    plt.clf()
+    generateScatterMetric("Distance", [400, 800], 100, "scatter_distance")
 
 # Generate scatter diagram of shots.
 def generateScatterShots():
-    # Extract the data.
-    df = pd.read_csv(inputDir + "/datasb.csv", sep = ";", index_col=0)    
-    g = sns.JointGrid(x="Shots (heuristic)", y="Shots (uniform)", data=df, xlim = [0, 300], 
-                      ylim = [0, 300])
-    g = g.plot_joint(plt.scatter, color = "m",  alpha=.6)
-    _ = g.ax_marg_x.hist(df["Shots (heuristic)"], color = "b", alpha=.6)
-    _ = g.ax_marg_y.hist(df["Shots (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
-    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(50))
-    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(50))
-    plt.savefig(exportDir + "/scatter_shots", dpi = 200, bbox_inches = "tight")
-    plt.clf()
+    generateScatterMetric("Shots", [0, 300], 50, "scatter_shots")
 
 # Generate scatter diagram of accuracy.
 def generateScatterAccuracy():
-    # Extract the data.
-    df = pd.read_csv(inputDir + "/datasb.csv", sep = ";", index_col=0)    
-    g = sns.JointGrid(x="Accuracy (heuristic)", y="Accuracy (uniform)", data=df, xlim = [0, 1], 
-                      ylim = [0, 1])
-    g = g.plot_joint(plt.scatter, color = "m",  alpha=.6)
-    _ = g.ax_marg_x.hist(df["Accuracy (heuristic)"], color = "b", alpha=.6)
-    _ = g.ax_marg_y.hist(df["Accuracy (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
-    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(0.1))
-    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(0.1))
-    plt.savefig(exportDir + "/scatter_accuracy", dpi = 200, bbox_inches = "tight")
-    plt.clf()
-
-# Generate heatmap diagram of difficulty.
-def generateScatterAccuracy():
-    # Extract the data.
-    df = pd.read_csv(inputDir + "/datasb.csv", sep = ";", index_col=0)    
-    g = sns.JointGrid(x="Accuracy (heuristic)", y="Accuracy (uniform)", data=df, xlim = [0, 1], 
-                      ylim = [0, 1])
-    g = g.plot_joint(plt.scatter, color = "m",  alpha=.6)
-    _ = g.ax_marg_x.hist(df["Accuracy (heuristic)"], color = "b", alpha=.6)
-    _ = g.ax_marg_y.hist(df["Accuracy (uniform)"], color = "r", alpha=.6, orientation="horizontal")    
-    _ = g.ax_joint.xaxis.set_major_locator(ticker.MultipleLocator(0.2))
-    _ = g.ax_joint.yaxis.set_major_locator(ticker.MultipleLocator(0.2))
-    plt.savefig(exportDir + "/scatter_accuracy", dpi = 200, bbox_inches = "tight")
-    plt.clf()
+    generateScatterMetric("Accuracy", [0, 1], 0.2, "scatter_accuracy")
 
 def difficultyHeatmap():
     # Extract the data.
@@ -286,17 +277,15 @@ def difficultyHeatmap():
 
 def positionHeatmap(dataset):
     # Extract the data.
-    with open(inputDir + "/" + dataset) as csvfile:
-        reader = csv.reader(csvfile, delimiter = ';', quotechar = '|')
-        positions = list(reader)
-        x = getArrayFromData(positions, 0, 1)
-        y = getArrayFromData(positions, 1, 1)
-        heatmap, xedges, yedges = np.histogram2d(x, y, bins = 70)
-        heatmap = gaussian_filter(heatmap, sigma = 2)
-        plt.imshow(heatmap.T, origin = 'lower', cmap = cm.jet)
-        plt.axis('off')
-        plt.savefig(exportDir + "/" + dataset.replace('.csv', '') + ".png", bbox_inches='tight')
-        plt.clf()
+    positions = pd.read_csv(inputDir + "/" + dataset, sep = ';', header = None, names = ["x", "y"])
+    x = getArrayFromData(positions, "x", 1)
+    y = getArrayFromData(positions, "y", 1)
+    heatmap, xedges, yedges = np.histogram2d(x, y, bins = 70)
+    heatmap = gaussian_filter(heatmap, sigma = 2)
+    plt.imshow(heatmap.T, origin = 'lower', cmap = cm.jet)
+    plt.axis('off')
+    plt.savefig(exportDir + "/" + dataset.replace('.csv', '') + ".png", bbox_inches='tight')
+    plt.clf()
 
 def degree(d, min, max, discardDeadEnd = True):
     if (d == 1 and discardDeadEnd):
@@ -329,10 +318,8 @@ def wilcoxonTest(data, safeColumn, uniformCoulumn):
 
 # Compare distribution.
 def compareDistributions(c1, c2, data, filename):
-    data1 = getArrayFromData(data, c1, 2)
-    data2 = getArrayFromData(data, c2, 2)
-    data1.sort()
-    data2.sort()
+    data1 = np.sort(getArrayFromData(data, c1, 2))
+    data2 = np.sort(getArrayFromData(data, c2, 2))
     d1mean = np.mean(data1)
     d2mean = np.mean(data2)
     d1std = np.std(data1)
@@ -348,65 +335,132 @@ def compareDistributions(c1, c2, data, filename):
     plt.savefig(exportDir + "/" + filename, dpi = 200, bbox_inches = "tight")
     plt.clf()
 
+### RENDERING FUNCTIONS #######################################################
+
+# Sets the font of the figures, whose text is typeset with LaTeX if usetex is
+# True.
+def setFont(size, usetex = True):
+    font = {'family' : 'serif',
+            'serif': ['Computer Modern'],
+            'weight' : 'bold',
+            'size'   : size}
+
+    plt.rc('text', usetex=usetex)
+    plt.rc('font', **font)
+
+# Prepares a worker process to render the figures with the Agg backend. The
+# folders are passed since the spawned workers only import this script. 
+def initializeRenderer(inputFolder, exportFolder, fontSize, usetex):
+    global inputDir, exportDir
+    inputDir = inputFolder
+    exportDir = exportFolder
+    plt.switch_backend("Agg")
+    setFont(fontSize, usetex)
+
+# Renders a figure, then closes all the figures so that the next one rendered
+# by the worker starts from a clean state.
+def renderFigure(function, args):
+    try:
+        function(*args)
+    finally:
+        plt.close("all")
+
+# Returns the figures of the graph, function and heatmap menus, as the function
+# rendering each one and its arguments. The heatmaps whose positions are not in
+# the input folder are skipped.
+def getFigures(data):
+    figures = [(generateGraph, (data, str(i + 1))) for i in range(len(GRAPHS))]
+    figures.extend([(plotFunction, (str(i + 1),)) for i in range(len(FUNCTIONS))])
+    figures.extend([(positionHeatmap, (dataset,)) for _, dataset in HEATMAPS
+                    if os.path.isfile(inputDir + "/" + dataset)])
+    return figures
+
+# Renders all the figures with a pool of worker processes. Each worker keeps
+# the LaTeX fonts and labels it has typeset for the following figures, and
+# matplotlib stores them in its cache folder, so only the new labels are 
+# typeset again on the next run. Returns the number of rendered and failed
+# figures.
+def renderAll(data, fontSize, usetex = True, workers = None):
+    figures = getFigures(data)
+    rendered = 0
+    failed = 0
+
+    with ProcessPoolExecutor(workers, initializer = initializeRenderer,
+                             initargs = (inputDir, exportDir, fontSize, usetex)) as executor:
+        futures = [executor.submit(renderFigure, function, args) for function, args in figures]
+        for (function, args), future in zip(figures, futures):
+            try:
+                future.result()
+                rendered = rendered + 1
+            except Exception as e:
+                print("[ERROR] " + function.__name__ + " " + str(args[-1]) + ": " + str(e))
+                failed = failed + 1
+
+    return rendered, failed
+
 ### MENU FUNCTIONS ############################################################
 
+# Graphs of the graph menu, in the order of the options of generateGraph.
+GRAPHS = ["Heuristic bar diagram", "Uniform bar diagram", "Kills", "Distance", "Shots", "Accuracy",
+          "Perception", "AvgKillTime", "AvgKillDistance"]
+
 # Menages the graph menu.
 def graphMenu(data):
     index = 0
 
     while True:
         print("\n[GRAPHS] Select a graph to generate:")
-        print("[1] Heuristic bar diagram")
-        print("[2] Uniform bar diagram")
-        print("[3] Kills")
-        print("[4] Distance")
-        print("[5] Shots")
-        print("[6] Accuracy")
-        print("[7] Perception")
-        print("[8] AvgKillTime")
-        print("[9] AvgKillDistance")
+        for i in range(len(GRAPHS)):
+            print("[" + str(i + 1) + "] " + GRAPHS[i])
+        print("[" + str(len(GRAPHS) + 1) + "] All")
         print("[0] Back\n")
 
         option = input("Option: ")
     
-        while (option != "1" and option != "2" and option != "3" and option != "4" and option != "5" 
-               and option != "6" and option != "7" and option != "8" and option != "9" and option != "0"):
+        while option not in [str(i) for i in range(len(GRAPHS) + 2)]:
             option = input("Invalid choice. Option: ")
     
-        if option == "1":
-            print("\nGenerating graph...") 
-            generateBarDiagramKills(data, True)
-        elif option == "2":
-            print("\nGenerating graph...")  
-            generateBarDiagramKills(data, False)
-        elif option == "3":
-            print("\nGenerating graph...")  
-            # generateScatterDiagram(data, 6, 13, True, 'Kills (heuristic)', 
-            #                        'Kills (uniform)', 'scatter_kills')
-            generateScatterKills()
-        elif option == "4":
-            print("\nGenerating graph...")
-            # generateScatterDiagram(data, 8, 15, False, 'AvgKillDistance (heuristic)', 
-            #                        'AvgKillDistance (uniform)', 'scatter_avg')
-            generateScatterDistance()
-        elif option == "5":
-            print("\nGenerating graph...")
-            generateScatterShots()
-        elif option == "6":
-            print("\nGenerating graph...")
-            generateScatterAccuracy()
-        elif option == "7":
-            print("\nGenerating graph...")
-            # generateBarDiagramDifficulty(data)
-            difficultyHeatmap()
-        elif option == "8":
-            print("\nGenerating graph...")
-            compareDistributions(7, 14, data, "AvgKillTime_distribution")
-        elif option == "9":
-            print("\nGenerating graph...")
-            compareDistributions(8, 15, data, "AvgKillDistance_distribution")
-        elif option == "0":
+        if option == "0":
             return
+        elif option == str(len(GRAPHS) + 1):
+            print("\nGenerating graphs...")
+            for i in range(len(GRAPHS)):
+                generateGraph(data, str(i + 1))
+        else:
+            print("\nGenerating graph...") 
+            generateGraph(data, option)
+
+# Generates a graph of the graph menu.
+def generateGraph(data, option):
+    if option == "1":
+        generateBarDiagramKills(data, True)
+    elif option == "2":
+        generateBarDiagramKills(data, False)
+    elif option == "3":
+        # generateScatterDiagram(data, 6, 13, True, 'Kills (heuristic)', 
+        #                        'Kills (uniform)', 'scatter_kills')
+        generateScatterKills()
+    elif option == "4":
+        # generateScatterDiagram(data, 8, 15, False, 'AvgKillDistance (heuristic)', 
+        #                        'AvgKillDistance (uniform)', 'scatter_avg')
+        generateScatterDistance()
+    elif option == "5":
+        generateScatterShots()
+    elif option == "6":
+        generateScatterAccuracy()
+    elif option == "7":
+        # generateBarDiagramDifficulty(data)
+        difficultyHeatmap()
+    elif option == "8":
+        compareDistributions("AvgKillTime (heuristic)", "AvgKillTime (uniform)", data, 
+                             "AvgKillTime_distribution")
+    elif option == "9":
+        compareDistributions("AvgKillDistance (heuristic)", "AvgKillDistance (uniform)", data, 
+                             "AvgKillDistance_distribution")
+
+# Functions of the function menu, in the order of the options of plotFunction.
+FUNCTIONS = ["[ROOM] Degree heuristic", "[TILE] Low visibility heuristic",
+             "[TILE] Medium visibility heuristic", "Interval fit"]
 
 # Menages the function menu.
 def functionMenu():
@@ -414,70 +468,70 @@ def functionMenu():
 
     while True:
         print("\n[FUNCTIONS] Select a function to plot:")
-        print("[1] [ROOM] Degree heuristic")
-        print("[2] [TILE] Low visibility heuristic")
-        print("[3] [TILE] Medium visibility heuristic")
-        print("[4] Interval fit")
+        for i in range(len(FUNCTIONS)):
+            print("[" + str(i + 1) + "] " + FUNCTIONS[i])
         print("[0] Back\n")
 
         option = input("Option: ")
     
-        while option != "1" and option != "2" and option != "3" and option != "4" and option != "0":
+        while option not in [str(i) for i in range(len(FUNCTIONS) + 1)]:
             option = input("Invalid choice. Option: ")
     
-        if option == "1":
-            print("\nPlotting function...") 
-            t1 = np.arange(0, 16, 1)
-            t2 = np.arange(0, 15, 0.001)
-            plt.ylabel(r'$D(r)$')
-            plt.xlabel(r'$deg(r)$')
-            plt.xticks(np.arange(0, 16, 2))
-            plt.yticks(np.arange(0, 1.1, 0.2))
-            plt.plot(t2, [degree(t, 0, 15) for t in t2], t1, [degree(t, 0, 15) for t in t1], "ro", lw = 2)
-            plt.savefig(exportDir + "/degree", dpi = 200, bbox_inches = "tight")
-            # plt.show()  
-            plt.clf()
-        elif option == "2":
-            print("\nPlotting function...")
-            t1 = np.arange(0, 16, 1)
-            t2 = np.arange(0, 15, 0.001)
-            plt.ylabel(r'$v(t)$')
-            plt.xlabel(r'$deg(t)$')
-            plt.xticks(np.arange(0, 16, 2))
-            plt.yticks(np.arange(0, 1.1, 0.2))
-            plt.plot(t2, [degree(t, 0, 15, False) for t in t2], t1, 
-                     [degree(t, 0, 15, False) for t in t1], 'ro', lw = 2)
-            plt.savefig(exportDir + "/visibility_low", dpi = 200, bbox_inches = "tight")
-            # plt.show()
-            plt.clf()        
-        elif option == "3":
-            print("\nPlotting function...")
-            t1 = np.arange(0, 16, 1)
-            t2 = np.arange(0, 15, 0.001)
-            plt.ylabel(r'$v(t)$')
-            plt.xlabel(r'$deg(t)$')
-            plt.xticks(np.arange(0, 16, 2))
-            plt.yticks(np.arange(0, 1.1, 0.2))
-            plt.plot(t2, [degreeMedium(t, 0, 15) for t in t2], t1, 
-                     [degreeMedium(t, 0, 15) for t in t1], 'ro', lw = 2)
-            plt.savefig(exportDir + "/visibility_medium", dpi = 200, bbox_inches = "tight")
-            # plt.show()
-            plt.clf()
-        elif option == "4":
-            print("\nPlotting function...")
-            t1 = np.arange(0, 1.1, 0.1)
-            t2 = np.arange(0, 1.02, 0.02)
-            plt.xlabel(r'$x$')
-            plt.ylabel(r'$d_{int}(x)$')
-            plt.xticks(np.arange(0, 1.1, 0.2))
-            plt.yticks(np.arange(0, 1.1, 0.2))
-            plt.plot(t2, [intervalDistance(0.3, 0.5, t) for t in t2], t1, 
-                     [intervalDistance(0.3, 0.5, t) for t in t1], 'ro', lw = 2)
-            plt.savefig(exportDir + "/interval", dpi = 200, bbox_inches = "tight")
-            # plt.show()
-            plt.clf()
-        elif option == "0":
+        if option == "0":
             return
+        else:
+            print("\nPlotting function...")
+            plotFunction(option)
+
+# Plots a function of the function menu.
+def plotFunction(option):
+    if option == "1":
+        t1 = np.arange(0, 16, 1)
+        t2 = np.arange(0, 15, 0.001)
+        plt.ylabel(r'$D(r)$')
+        plt.xlabel(r'$deg(r)$')
+        plt.xticks(np.arange(0, 16, 2))
+        plt.yticks(np.arange(0, 1.1, 0.2))
+        plt.plot(t2, [degree(t, 0, 15) for t in t2], t1, [degree(t, 0, 15) for t in t1], "ro", lw = 2)
+        plt.savefig(exportDir + "/degree", dpi = 200, bbox_inches = "tight")
+        # plt.show()
+        plt.clf()
+    elif option == "2":
+        t1 = np.arange(0, 16, 1)
+        t2 = np.arange(0, 15, 0.001)
+        plt.ylabel(r'$v(t)$')
+        plt.xlabel(r'$deg(t)$')
+        plt.xticks(np.arange(0, 16, 2))
+        plt.yticks(np.arange(0, 1.1, 0.2))
+        plt.plot(t2, [degree(t, 0, 15, False) for t in t2], t1,
+                 [degree(t, 0, 15, False) for t in t1], 'ro', lw = 2)
+        plt.savefig(exportDir + "/visibility_low", dpi = 200, bbox_inches = "tight")
+        # plt.show()
+        plt.clf()
+    elif option == "3":
+        t1 = np.arange(0, 16, 1)
+        t2 = np.arange(0, 15, 0.001)
+        plt.ylabel(r'$v(t)$')
+        plt.xlabel(r'$deg(t)$')
+        plt.xticks(np.arange(0, 16, 2))
+        plt.yticks(np.arange(0, 1.1, 0.2))
+        plt.plot(t2, [degreeMedium(t, 0, 15) for t in t2], t1,
+                 [degreeMedium(t, 0, 15) for t in t1], 'ro', lw = 2)
+        plt.savefig(exportDir + "/visibility_medium", dpi = 200, bbox_inches = "tight")
+        # plt.show()
+        plt.clf()
+    elif option == "4":
+        t1 = np.arange(0, 1.1, 0.1)
+        t2 = np.arange(0, 1.02, 0.02)
+        plt.xlabel(r'$x$')
+        plt.ylabel(r'$d_{int}(x)$')
+        plt.xticks(np.arange(0, 1.1, 0.2))
+        plt.yticks(np.arange(0, 1.1, 0.2))
+        plt.plot(t2, [intervalDistance(0.3, 0.5, t) for t in t2], t1,
+                 [intervalDistance(0.3, 0.5, t) for t in t1], 'ro', lw = 2)
+        plt.savefig(exportDir + "/interval", dpi = 200, bbox_inches = "tight")
+        # plt.show()
+        plt.clf()
 
 # Change the font size
 def fontMenu():
@@ -490,15 +544,16 @@ def fontMenu():
             val = float(userInput)
             done = True
         except ValueError:
-            option = input("Invalid value. Size: ")
+            userInput = input("Invalid value. Size: ")
     
-    font = {'family' : 'serif',
-            'serif': ['Computer Modern'],
-            'weight' : 'bold',
-            'size'   : val}
+    setFont(val)
 
-    plt.rc('text', usetex=True)
-    plt.rc('font', **font)
+# Heatmaps of the heatmap menu and the positions they are generated from.
+HEATMAPS = [("Arena (heuristic)", "heatmap_arena_SS.csv"), ("Arena (uniform)", "heatmap_arena_SUD.csv"),
+            ("Corridors (heuristic)", "heatmap_corridors_SS.csv"),
+            ("Corridors (uniform)", "heatmap_corridors_SUD.csv"),
+            ("Intense (heuristic)", "heatmap_intense_SS.csv"),
+            ("Intense (uniform)", "heatmap_intense_SUD.csv")]
 
 # Menages the heatmap menu.
 def heatmapMenu():
@@ -506,34 +561,19 @@ def heatmapMenu():
 
     while True:
         print("\n[HEATMAPS] Select a heatmap to generate:")
-        print("[1] Arena (heuristic)")
-        print("[2] Arena (uniform)")
-        print("[3] Corridors (heuristic)")
-        print("[4] Corridors (uniform)")
-        print("[5] Intense (heuristic)")
-        print("[6] Intense (uniform)")
+        for i in range(len(HEATMAPS)):
+            print("[" + str(i + 1) + "] " + HEATMAPS[i][0])
         print("[0] Back\n")
 
         option = input("Option: ")
     
-        while (option != "1" and option != "2" and option != "3" and option != "4" and option != "5" 
-               and option != "6"  and option != "0"):
+        while option not in [str(i) for i in range(len(HEATMAPS) + 1)]:
             option = input("Invalid choice. Option: ")
     
-        if option == "1":
-            positionHeatmap("heatmap_arena_SS.csv")
-        elif option == "2":
-            positionHeatmap("heatmap_arena_SUD.csv") 
-        elif option == "3":
-            positionHeatmap("heatmap_corridors_SS.csv")
-        elif option == "4":
-            positionHeatmap("heatmap_corridors_SUD.csv")
-        elif option == "5":
-            positionHeatmap("heatmap_intense_SS.csv")
-        elif option == "6":
-            positionHeatmap("heatmap_intense_SUD.csv")   
-        elif option == "0":
+        if option == "0":
             return
+        else:
+            positionHeatmap(HEATMAPS[int(option) - 1][1])
 
 # Menages the Wilcoxon menu.
 def wilcoxonMenu(data):
@@ -556,88 +596,106 @@ def wilcoxonMenu(data):
             option = input("Invalid choice. Option: ")
     
         if option == "1":
-            wilcoxonTest(data, 7, 14)
+            wilcoxonTest(data, "AvgKillTime (heuristic)", "AvgKillTime (uniform)")
         elif option == "2":
-            wilcoxonTest(data, 8, 15) 
+            wilcoxonTest(data, "AvgKillDistance (heuristic)", "AvgKillDistance (uniform)") 
         elif option == "3":
-            wilcoxonTest(data, 6, 13)
+            wilcoxonTest(data, "Kills (heuristic)", "Kills (uniform)")
         elif option == "4":
-            wilcoxonTest(data, 5, 12) 
+            wilcoxonTest(data, "Distance (heuristic)", "Distance (uniform)") 
         elif option == "5":
-            wilcoxonTest(data, 2, 9) 
+            wilcoxonTest(data, "Shots (heuristic)", "Shots (uniform)") 
         elif option == "6":
-            wilcoxonTest(data, 4, 11) 
+            wilcoxonTest(data, "Accuracy (heuristic)", "Accuracy (uniform)") 
         elif option == "0":
             return
 
 ### MAIN ######################################################################
 
-# Create the input folder if needed.
-inputDir = "./Input"
-if not os.path.exists(inputDir):
-    os.makedirs(inputDir)
-
-exportDir = "./Export"
-if not os.path.exists(exportDir):
-    os.makedirs(exportDir)
-
-font = {'family' : 'serif',
-        'serif': ['Computer Modern'],
-        'weight' : 'bold',
-        'size'   : 12.5}
-
-plt.rc('text', usetex=True)
-plt.rc('font', **font)
-
-'''
-plt.rcParams["font.family"] = "Calibri"
-plt.rcParams["font.size"] = 14.5
-'''
-
-print("RESULT ANALYSIS")
-
-# Get the files and process them.
-data = getData(inputDir)
-
-while True:
-    print("\n[MENU] Select an option:")
-    print("[1] Wilcoxon signed-rank test")
-    print("[2] Bernulli validation")
-    print("[3] Generate graphs")
-    print("[4] Plot functions")
-    print("[5] Generate position heatmaps")
-    print("[6] Change font size")
-    print("[7] Change file")
-    print("[0] Quit\n")
-
-    option = input("Option: ")
-
-    while (option != "1" and option != "2" and option != "3" and option != "4" and option != "5" 
-           and option != "6" and option != "7" and option != "0"):
-        option = input("Invalid choice. Option: ")
-    if option == "1":
-        wilcoxonMenu(data);
-    elif option == "2":
-        harder = getArrayFromData(data, 16)
-        safeCount = len([1 for x in harder if x == "safe"])
-        uniformCount = len([1 for x in harder if x == "uniform"])
-        equalCount = len([1 for x in harder if x == "equal"])
-        totalCount = safeCount + uniformCount + equalCount
-        pvalue = binom_test(safeCount, totalCount)
-        print("\n[BERNULLI TEST] Results:")
-        print("#safe = " + str(safeCount))
-        print("#uniform = " + str(uniformCount))
-        print("#equal = " + str(equalCount))
-        print("p-value = " + str(pvalue))
-    elif option == "3":
-        graphMenu(data)
-    elif option == "4":
-        functionMenu()
-    elif option == "5":
-        heatmapMenu()
-    elif option == "6":
-        fontMenu()
-    elif option == "7":
-        data = getData(inputDir)
-    elif option == "0":
-        break
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Analyzes the results of the experiment.")
+    parser.add_argument("--render-all", action = "store_true",
+                        help = "render every graph, function and heatmap in the export folder "
+                        "without a display and quit")
+    parser.add_argument("--workers", type = int, default = None,
+                        help = "number of processes rendering the figures, all the cores by default")
+    parser.add_argument("--font-size", type = float, default = 12.5, help = "font size of the figures")
+    args = parser.parse_args()
+
+    # Create the input folder if needed.
+    inputDir = "./Input"
+    if not os.path.exists(inputDir):
+        os.makedirs(inputDir)
+
+    exportDir = "./Export"
+    if not os.path.exists(exportDir):
+        os.makedirs(exportDir)
+
+    setFont(args.font_size)
+
+    '''
+    plt.rcParams["font.family"] = "Calibri"
+    plt.rcParams["font.size"] = 14.5
+    '''
+
+    print("RESULT ANALYSIS")
+
+    # Without a prompt the data file must already be in the input folder.
+    if args.render_all and not os.path.isfile(inputDir + "/data.csv"):
+        parser.error("--render-all requires " + inputDir + "/data.csv")
+
+    # Get the files and process them.
+    data = getData(inputDir)
+
+    if args.render_all:
+        # The text is typeset with LaTeX only if it is installed.
+        usetex = shutil.which("latex") is not None
+        if not usetex:
+            print("[WARNING] LaTeX not found, the text is rendered by matplotlib.")
+        print("\nRendering the figures...")
+        rendered, failed = renderAll(data, args.font_size, usetex, args.workers)
+        print("Done. Rendered " + str(rendered) + " figures, " + str(failed) + " failed.")
+        sys.exit(1 if failed > 0 else 0)
+
+    while True:
+        print("\n[MENU] Select an option:")
+        print("[1] Wilcoxon signed-rank test")
+        print("[2] Bernulli validation")
+        print("[3] Generate graphs")
+        print("[4] Plot functions")
+        print("[5] Generate position heatmaps")
+        print("[6] Change font size")
+        print("[7] Change file")
+        print("[0] Quit\n")
+
+        option = input("Option: ")
+
+        while (option != "1" and option != "2" and option != "3" and option != "4" and option != "5" 
+               and option != "6" and option != "7" and option != "0"):
+            option = input("Invalid choice. Option: ")
+        if option == "1":
+            wilcoxonMenu(data);
+        elif option == "2":
+            harder = getArrayFromData(data, "Difficulty (real)")
+            safeCount = len([1 for x in harder if x == "safe"])
+            uniformCount = len([1 for x in harder if x == "uniform"])
+            equalCount = len([1 for x in harder if x == "equal"])
+            totalCount = safeCount + uniformCount + equalCount
+            pvalue = binom_test(safeCount, totalCount)
+            print("\n[BERNULLI TEST] Results:")
+            print("#safe = " + str(safeCount))
+            print("#uniform = " + str(uniformCount))
+            print("#equal = " + str(equalCount))
+            print("p-value = " + str(pvalue))
+        elif option == "3":
+            graphMenu(data)
+        elif option == "4":
+            functionMenu()
+        elif option == "5":
+            heatmapMenu()
+        elif option == "6":
+            fontMenu()
+        elif option == "7":
+            data = getData(inputDir)
+        elif option == "0":
+            break
@@ -0,0 +1,178 @@
+import os
+import csv
+import json
+import argparse
+import numpy as np
+from LogIngestion import getSessionKeys, loadSessions
+
+### PARAMETERS ###############################################################
+
+# Metrics computed for each session.
+METRICS = ["Shots", "Hits", "Accuracy", "Distance", "Kills", "AvgKillTime", "AvgKillDistance"]
+
+# Columns of the data table, with a row for each test comparing the heuristic
+# (SS) and the uniform (SUD*) placement of a map. These are the columns of
+# data.csv and the header of datasb.csv.
+DATA_COLUMNS = ["Identifier", "Map"] + [metric + " (heuristic)" for metric in METRICS] + \
+               [metric + " (uniform)" for metric in METRICS] + ["Difficulty (real)",
+                                                                "Difficulty (perceived)"]
+
+# Types of the columns of the data table which are not numeric.
+DATA_TYPES = {"Identifier": str, "Map": str, "Difficulty (real)": str, "Difficulty (perceived)": str}
+
+# Question of the survey asking which map was harder: 1 is the first played
+# map, 2 the second one and 3 means no difference.
+PERCEIVED_DIFFICULTY_QUESTION = 5
+
+### METRICS FUNCTIONS #########################################################
+
+# Returns the index of the session of each row of a table.
+def getSessionIndex(sessionKeys, table):
+    return np.searchsorted(sessionKeys, getSessionKeys(table))
+
+# Counts the rows of a table in each session.
+def countPerSession(sessionKeys, table):
+    return np.bincount(getSessionIndex(sessionKeys, table), minlength = len(sessionKeys))
+
+# Computes the length of the path covered in each session from its position
+# logs, which are sorted by session and timestamp.
+def getPathLengths(sessionKeys, positions):
+    index = getSessionIndex(sessionKeys, positions)
+    lengths = np.hypot(np.diff(positions["x"]), np.diff(positions["y"]))
+    sameSession = index[1:] == index[:-1]
+    return np.bincount(index[1:][sameSession], weights = lengths[sameSession],
+                       minlength = len(sessionKeys))
+
+# Divides two arrays, NaN where the divisor is 0.
+def safeDivide(a, b):
+    result = np.full(len(a), np.nan)
+    np.divide(a, b, out = result, where = b != 0)
+    return result
+
+# Computes the metrics of each session of the merged store. The final
+# statistics logged by the game are used where they exist, otherwise the
+# metrics are derived from the game logs as the experiment control does when
+# it generates the statistics. The covered distance is also derived from the
+# positions of the complete sessions whose statistics miss it. Returns the
+# sessions table with a column for each metric.
+def getSessionMetrics(sessions):
+    table = dict(sessions["sessions"])
+    sessionKeys = getSessionKeys(table)
+    count = len(sessionKeys)
+
+    statistics = sessions["finalStatistics"]
+    statisticsIndex = getSessionIndex(sessionKeys, statistics)
+
+    def fromStatistics(column, default):
+        values = np.array(default)
+        values[statisticsIndex] = statistics[column]
+        return values
+
+    # The statistics generated without a game log have no covered distance.
+    loggedDistance = fromStatistics("coveredDistance", np.zeros(count))
+    pathLengths = getPathLengths(sessionKeys, sessions["positionLogs"])
+    distance = np.where(loggedDistance > 0, loggedDistance,
+                        np.where(table["complete"] & (pathLengths > 0), pathLengths, np.nan))
+
+    shots = fromStatistics("totalShots", countPerSession(sessionKeys, sessions["shotLogs"]))
+    hits = fromStatistics("totalHits", countPerSession(sessionKeys, sessions["hitLogs"]))
+    kills = np.where(table["hasStatistics"],
+                     countPerSession(sessionKeys, sessions["targetStatisticsLogs"]),
+                     countPerSession(sessionKeys, sessions["killLogs"]))
+
+    table.update({"Shots": shots, "Hits": hits, "Accuracy": safeDivide(hits, shots),
+                  "Distance": distance, "Kills": kills,
+                  "AvgKillTime": safeDivide(table["duration"], kills),
+                  "AvgKillDistance": safeDivide(distance, kills)})
+    return table
+
+### ANSWERS FUNCTIONS #########################################################
+
+# Reads the perceived difficulty of each test from the answers of the survey,
+# as the placement of the map perceived as harder or "equal".
+def getPerceivedDifficulties(inputDir):
+    difficulties = {}
+
+    for fileName in sorted(os.listdir(inputDir)):
+        if not fileName.endswith("_answers.json"):
+            continue
+        with open(inputDir + "/" + fileName) as f:
+            answers = json.load(f)
+        for answer in answers["answers"]:
+            if answer["questionId"] == PERCEIVED_DIFFICULTY_QUESTION and len(answer["answers"]) > 0:
+                choice = answer["answers"][0]
+                if choice == 3:
+                    difficulties[answers["testID"]] = "equal"
+                else:
+                    playedMap = answers["playedMaps"][choice - 1]
+                    difficulties[answers["testID"]] = "safe" if "_SS" in playedMap else "uniform"
+
+    return difficulties
+
+### DATA FUNCTIONS ############################################################
+
+# Pairs the heuristic and the uniform session of each test and map. Returns a
+# row of the data table for each pair, with None for the missing values.
+# Only the complete sessions are used if onlyComplete is True.
+def getDataRows(metrics, perceivedDifficulties = {}, onlyComplete = False):
+    heuristic = metrics["placement"] == "SS"
+    uniform = np.char.startswith(metrics["placement"], "SUD")
+    if onlyComplete:
+        heuristic &= metrics["complete"]
+        uniform &= metrics["complete"]
+
+    testKeys = np.char.add(np.char.add(metrics["testID"], "_"), metrics["map"])
+    _, heuristicIndex, uniformIndex = np.intersect1d(testKeys[heuristic], testKeys[uniform],
+                                                     return_indices = True)
+    heuristicIndex = np.flatnonzero(heuristic)[heuristicIndex]
+    uniformIndex = np.flatnonzero(uniform)[uniformIndex]
+
+    # The real difficulty is the placement of the map with least kills.
+    heuristicKills = metrics["Kills"][heuristicIndex]
+    uniformKills = metrics["Kills"][uniformIndex]
+    real = np.where(heuristicKills < uniformKills, "safe",
+                    np.where(uniformKills < heuristicKills, "uniform", "equal"))
+
+    rows = []
+    for i in range(len(heuristicIndex)):
+        testID = metrics["testID"][heuristicIndex[i]]
+        row = [testID, metrics["map"][heuristicIndex[i]]]
+        for index in [heuristicIndex[i], uniformIndex[i]]:
+            row.extend([(None if np.isnan(metrics[metric][index]) else metrics[metric][index].item())
+                        for metric in METRICS])
+        row.extend([real[i], perceivedDifficulties.get(testID)])
+        rows.append(row)
+
+    return rows
+
+# Exports the data table in the format read by getData, optionally with the
+# header of datasb.csv.
+def exportData(rows, filePath, header = False):
+    with open(filePath, "w", newline = "") as csvfile:
+        writer = csv.writer(csvfile, delimiter = ";", quotechar = "|")
+        if header:
+            writer.writerow(DATA_COLUMNS)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+
+### MAIN ######################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Computes the metrics of each session from the "
+                                     "ingested logs and exports the data table.")
+    parser.add_argument("--input", default = "../../../Results/Data",
+                        help = "folder of the logs, with the answers of the survey")
+    parser.add_argument("--store", default = "./Input/Store", help = "folder of the tables")
+    parser.add_argument("--format", default = "npz", choices = ["npz", "parquet"],
+                        help = "file format of the tables")
+    parser.add_argument("--output", default = "./Input/sessions.csv", help = "CSV output file")
+    parser.add_argument("--header", action = "store_true",
+                        help = "write the header of the columns, as in datasb.csv")
+    parser.add_argument("--complete", action = "store_true", help = "only use the complete sessions")
+    args = parser.parse_args()
+
+    print("Computing the metrics...")
+    metrics = getSessionMetrics(loadSessions(args.store, args.format))
+    rows = getDataRows(metrics, getPerceivedDifficulties(args.input), args.complete)
+    exportData(rows, args.output, args.header)
+    print("Done. Exported " + str(len(rows)) + " tests.")
@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+import pytest
+import numpy as np
+from LogIngestion import LOG_COLUMNS, parseLogFileName, parseLogFile, decodeLogFile, \
+    streamLogFile, ingestLogs, loadStore, loadSessions
+
+### PARAMETERS ###############################################################
+
+logsDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "Results", "Data")
+
+# Game and statistics logs of the results.
+logFileNames = sorted([f for f in os.listdir(logsDir) if parseLogFileName(f) is not None])
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Asserts that two stores have the same tables, regardless of the order of
+# their rows.
+def assertSameStores(store, expected):
+    for name in ["sessions"] + list(LOG_COLUMNS):
+        assert sorted(store[name]) == sorted(expected[name])
+        if len(expected[name]["fileName"]) == 0:
+            assert len(store[name]["fileName"]) == 0
+            continue
+        order = np.lexsort([store[name][column] for column in sorted(store[name])])
+        expectedOrder = np.lexsort([expected[name][column] for column in sorted(expected[name])])
+        for column in expected[name]:
+            np.testing.assert_array_equal(store[name][column][order],
+                                          expected[name][column][expectedOrder])
+
+# Merges the parts of each session of a store, grouping the rows one by one.
+# Returns the game parts, the statistics variants and the rows of each kind of 
+# log sorted by timestamp, by session.
+def groupSessions(store):
+    sessions = {}
+    files = store["sessions"]
+    for i in range(len(files["testID"])):
+        key = (files["testID"][i], files["map"][i], files["placement"][i])
+        session = sessions.setdefault(key, {"parts": [], "statistics": [], "logs": {}})
+        if files["log"][i] == "game":
+            session["parts"].append(int(files["logPart"][i]))
+        else:
+            session["statistics"].append(files["variant"][i])
+
+    for kind in LOG_COLUMNS:
+        table = store[kind]
+        rows = {}
+        for i in range(len(table["testID"])):
+            key = (table["testID"][i], table["map"][i], table["placement"][i])
+            rows.setdefault(key, []).append(i)
+        for key, indices in rows.items():
+            if kind == "finalStatistics":
+                indices = [max(indices, key = lambda i: table["logPart"][i])]
+            else:
+                indices = sorted(indices, key = lambda i: table["timestamp"][i])
+            sessions[key]["logs"][kind] = indices
+
+    return sessions
+
+### TESTS ####################################################################
+
+# Checks the tables parsed from each log against the entries of the JSON.
+@pytest.mark.parametrize("fileName", logFileNames)
+def testParseLogFile(fileName):
+    session, tables = parseLogFile(os.path.join(logsDir, fileName))
+    with open(os.path.join(logsDir, fileName)) as f:
+        content = json.load(f)
+
+    assert session["fileName"] == fileName
+    assert session["logPart"] == content["logPart"]
+    assert session["duration"] == content["gameInfo"]["duration"]
+    assert sorted(tables) == sorted([kind for kind in LOG_COLUMNS if kind in content])
+    for kind, table in tables.items():
+        entries = content[kind] if isinstance(content[kind], list) else [content[kind]]
+        assert len(table["testID"]) == len(entries)
+        np.testing.assert_array_equal(table["fileName"], [fileName] * len(entries))
+        for name, type in LOG_COLUMNS[kind]:
+            np.testing.assert_array_equal(table[name], np.array([entry[name] for entry in entries], 
+                                                                 dtype = type))
+
+# Checks that the logs decoded as a stream match the logs decoded as a whole.
+@pytest.mark.parametrize("fileName", logFileNames)
+def testStreamLogFile(fileName):
+    pytest.importorskip("ijson")
+    assert streamLogFile(os.path.join(logsDir, fileName)) == decodeLogFile(os.path.join(logsDir, fileName))
+
+# Changes one of two log files with the same session key and checks that the
+# updated store matches a full rebuild.
+def testChangeFileSharingKey(tmp_path):
+    inputDir = str(tmp_path / "Logs")
+    os.makedirs(inputDir)
+    fileName = "18031515174479_intense_SS_game.json"
+    shutil.copy(os.path.join(logsDir, fileName), inputDir)
+    shutil.copy(os.path.join(logsDir, fileName), inputDir + "/" + fileName.replace("game", "game_incomplete"))
+    ingestLogs(inputDir, str(tmp_path / "Store"), workers = 1)
+
+    filePath = inputDir + "/" + fileName.replace("game", "game_incomplete")
+    with open(filePath) as f:
+        content = json.load(f)
+    content["positionLogs"] = content["positionLogs"][:-1]
+    with open(filePath, "w") as f:
+        json.dump(content, f)
+
+    assert ingestLogs(inputDir, str(tmp_path / "Store"), workers = 1) == (1, 1, 0)
+    ingestLogs(inputDir, str(tmp_path / "Rebuilt"), workers = 1)
+    assertSameStores(loadStore(str(tmp_path / "Store")), loadStore(str(tmp_path / "Rebuilt")))
+
+# Ingests half of the logs, then adds the others, changes some and deletes
+# some, checking that the updated store matches a full rebuild.
+def testIngestChangedLogs(tmp_path):
+    inputDir = str(tmp_path / "Logs")
+    os.makedirs(inputDir)
+    for fileName in logFileNames[::2]:
+        shutil.copy(os.path.join(logsDir, fileName), inputDir)
+    assert ingestLogs(inputDir, str(tmp_path / "Store"), workers = 1) == (len(logFileNames[::2]), 0, 0)
+
+    for fileName in logFileNames[1::2]:
+        shutil.copy(os.path.join(logsDir, fileName), inputDir)
+    for fileName in logFileNames[:8:4]:
+        os.remove(inputDir + "/" + fileName)
+    for fileName in logFileNames[2:10:4]:
+        with open(inputDir + "/" + fileName) as f:
+            content = json.load(f)
+        content["duration"] = -1
+        with open(inputDir + "/" + fileName, "w") as f:
+            json.dump(content, f, indent = 1)
+
+    parsed = len(logFileNames[1::2]) + 2
+    skipped = len(logFileNames[::2]) - 4
+    assert ingestLogs(inputDir, str(tmp_path / "Store"), workers = 1) == (parsed, skipped, 2)
+    ingestLogs(inputDir, str(tmp_path / "Rebuilt"), workers = 1)
+    assertSameStores(loadStore(str(tmp_path / "Store")), loadStore(str(tmp_path / "Rebuilt")))
+
+# Checks the sessions reassembled from the bundled logs against the parts of
+# each session grouped one by one.
+def testReassembleSessions(tmp_path):
+    ingestLogs(logsDir, str(tmp_path / "Store"), workers = 1)
+    store = loadStore(str(tmp_path / "Store"))
+    merged = loadSessions(str(tmp_path / "Store"))
+    sessions = groupSessions(store)
+
+    table = merged["sessions"]
+    assert len(table["testID"]) == len(sessions)
+    for i in range(len(table["testID"])):
+        session = sessions[(table["testID"][i], table["map"][i], table["placement"][i])]
+        parts = sorted(session["parts"])
+        assert table["parts"][i] == len(parts)
+        assert table["complete"][i] == (len(parts) > 0 and parts == list(range(len(parts))))
+        assert table["hasStatistics"][i] == (len(session["statistics"]) > 0)
+        assert table["generated"][i] == any(["generated" in variant for variant in session["statistics"]])
+
+    for kind in LOG_COLUMNS:
+        keys = list(zip(merged[kind]["testID"], merged[kind]["map"], merged[kind]["placement"]))
+        indices = []
+        for key in sorted(set(keys)):
+            indices.extend(sessions[key]["logs"][kind])
+        assert sorted(keys) == keys
+        for name in merged[kind]:
+            np.testing.assert_array_equal(merged[kind][name], store[kind][name][indices])
@@ -0,0 +1,68 @@
+import os
+import csv
+import pytest
+import pandas as pd
+from SessionMetrics import DATA_COLUMNS, DATA_TYPES
+from ResultAnalyzer import getArrayFromData, getCountsByMap, countOccurencies
+
+### PARAMETERS ###############################################################
+
+dataPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Input", "data.csv")
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Reads the data table as a frame, as getData does.
+def readData():
+    return pd.read_csv(dataPath, sep = ';', header = None, names = DATA_COLUMNS, dtype = DATA_TYPES)
+
+# Reads the data table as a list of rows.
+def readRows():
+    with open(dataPath) as csvfile:
+        return list(csv.reader(csvfile, delimiter = ';', quotechar = '|'))
+
+# Counts the occurrences of each value from min to max - 1 of a column in the
+# rows of a map, scanning the rows for each value.
+def getCountInRows(rows, column, map, min, max):
+    totalCount = list()
+
+    for i in range(min, max):
+        count = 0
+        for j in range(len(rows)):
+            if rows[j][1] == map and int(float(rows[j][column])) == i:
+                count = count + 1
+        totalCount.append(count)
+
+    return totalCount
+
+# Counts the occurrences of the pair of values of the i-th element of two 
+# arrays, scanning all the pairs.
+def countPairOccurrences(array1, array2, i):
+    count = 0
+
+    for j in range(len(array1)):
+        if array1[i] == array1[j] and array2[i] == array2[j]:
+            count = count + 1
+
+    return count
+
+### TESTS ####################################################################
+
+# Checks the kills counted by map against the scan of the rows for each value.
+@pytest.mark.parametrize("column", [6, 13])
+def testCountsByMap(column):
+    counts = getCountsByMap(readData(), DATA_COLUMNS[column], 3, 17)
+    rows = readRows()
+
+    for map in ["arena", "corridors", "intense"]:
+        assert counts.loc[map].tolist() == getCountInRows(rows, column, map, 3, 17)
+
+# Checks the occurrences of the pairs of the scatter diagrams against the scan
+# of all the pairs for each element.
+@pytest.mark.parametrize("columns", [(6, 13), (2, 9), (3, 10)])
+def testCountOccurencies(columns):
+    data = readData()
+    data1 = getArrayFromData(data, columns[0], 1)
+    data2 = getArrayFromData(data, columns[1], 1)
+
+    assert countOccurencies(data1, data2).tolist() == \
+        [countPairOccurrences(data1, data2, i) for i in range(len(data1))]
@@ -0,0 +1,43 @@
+import os
+import csv
+import math
+from LogIngestion import ingestLogs, loadSessions
+from SessionMetrics import METRICS, getSessionMetrics, getDataRows
+
+### PARAMETERS ###############################################################
+
+analyzerDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logsDir = os.path.join(analyzerDir, "..", "..", "..", "Results", "Data")
+
+### SUPPORT FUNCTIONS #########################################################
+
+# Converts a value of the data table to a float, None if it is missing.
+def toValue(text):
+    return float(text) if text != "" else None
+
+### TESTS ####################################################################
+
+# Checks the metrics computed from the bundled logs against the data table 
+# produced by the spreadsheet. The tests are matched by map and shots, since
+# the identifiers of the spreadsheet are rounded.
+def testDataRows(tmp_path):
+    ingestLogs(logsDir, str(tmp_path / "Store"), workers = 1)
+    rows = getDataRows(getSessionMetrics(loadSessions(str(tmp_path / "Store"))))
+    with open(os.path.join(analyzerDir, "Input", "data.csv")) as csvfile:
+        expectedRows = list(csv.reader(csvfile, delimiter = ';', quotechar = '|'))
+
+    shots = [2, 2 + len(METRICS)]
+    matched = 0
+    for row in rows:
+        candidates = [expected for expected in expectedRows if expected[1] == row[1] and 
+                      all([toValue(expected[i]) == row[i] for i in shots])]
+        if len(candidates) == 0:
+            continue
+        matched = matched + 1
+        for value, expected in zip(row[2:2 + 2 * len(METRICS)], candidates[0][2:2 + 2 * len(METRICS)]):
+            if value is not None and expected != "":
+                assert math.isclose(value, toValue(expected), rel_tol = 1e-6)
+        assert row[2 + 2 * len(METRICS)] == candidates[0][2 + 2 * len(METRICS)]
+
+    assert matched > len(rows) / 2